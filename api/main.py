@@ -24,6 +24,8 @@ from api.models import (
     ModelsResponse,
     ModelStats,
     DriftAnalysis,
+    DriftBatchRequest,
+    DriftBatchResponse,
     DashboardStats,
     HealthResponse,
     RAGRunSummary,
@@ -39,6 +41,7 @@ from core.db import (
     get_recent_runs,
     get_runs_by_model,
     get_drift_analysis,
+    get_drift_analysis_batch,
     get_rag_run_by_id,
     get_recent_rag_runs,
     get_rag_runs_by_model,
@@ -148,7 +151,7 @@ async def run_evaluation(
 @app.get("/runs", response_model=RunListResponse)
 async def get_runs(
     page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    page_size: int = Query(20, ge=1, le=1000, description="Items per page"),
     model: Optional[str] = Query(None, description="Filter by model name"),
     min_accuracy: Optional[float] = Query(None, ge=0.0, le=1.0, description="Minimum accuracy threshold")
 ):
@@ -156,7 +159,7 @@ async def get_runs(
     Get paginated list of evaluation runs with optional filters.
 
     - **page**: Page number (starts at 1)
-    - **page_size**: Number of results per page (max 100)
+    - **page_size**: Number of results per page (max 1000)
     - **model**: Filter by specific model name
     - **min_accuracy**: Filter runs with accuracy >= this value
     """
@@ -338,6 +341,40 @@ async def get_drift(
     )
 
 
+@app.post("/drift/batch", response_model=DriftBatchResponse)
+async def get_drift_batch(request: DriftBatchRequest):
+    """
+    Analyze drift for several models in one request.
+
+    Same comparison as `/drift/{model_name}`, computed from a single database query.
+
+    - **models**: Model names to analyze
+    - **threshold**: Accuracy drop threshold (default 5%)
+
+    Returns drift results keyed by model name; models with no runs are omitted.
+    """
+    invalid_models = [m for m in request.models if m not in AVAILABLE_MODELS]
+    if invalid_models:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid models: {invalid_models}. Available: {AVAILABLE_MODELS}"
+        )
+
+    analysis = get_drift_analysis_batch(request.models, request.threshold)
+
+    return DriftBatchResponse(results={
+        model_name: DriftAnalysis(
+            model_name=model_name,
+            latest_run=RunSummary.model_validate(latest_run),
+            best_run=RunSummary.model_validate(best_run),
+            has_drifted=has_drifted,
+            accuracy_drop=best_run.accuracy - latest_run.accuracy,
+            threshold=request.threshold
+        )
+        for model_name, (latest_run, best_run, has_drifted) in analysis.items()
+    })
+
+
 @app.get("/stats", response_model=DashboardStats)
 async def get_dashboard_stats():
     """
@@ -631,6 +668,7 @@ async def root():
             "get_run_detail": "GET /run/{id}",
             "get_models": "GET /models",
             "get_drift": "GET /drift/{model}",
+            "get_drift_batch": "POST /drift/batch",
             "get_stats": "GET /stats",
             "test_alerts": "POST /test-alerts/{model}",
             "rag_runs": "GET /rag-runs",
@@ -99,6 +99,17 @@ class DriftAnalysis(BaseModel):
     threshold: float
 
 
+class DriftBatchRequest(BaseModel):
+    """Request drift analysis for several models at once."""
+    models: List[str] = Field(..., min_length=1, description="Model names to analyze.")
+    threshold: float = Field(0.05, ge=0.0, le=1.0, description="Accuracy drop threshold")
+
+
+class DriftBatchResponse(BaseModel):
+    """Drift analysis keyed by model name (models without runs are omitted)."""
+    results: Dict[str, DriftAnalysis]
+
+
 class DashboardStats(BaseModel):
     """Overall dashboard statistics."""
     total_runs: int
@@ -348,6 +348,47 @@ def get_drift_analysis(model_name: str, threshold: float = 0.05) -> Tuple[Option
         db.close()
 
 
+def get_drift_analysis_batch(
+    model_names: List[str],
+    threshold: float = 0.05
+) -> Dict[str, Tuple[Run, Run, bool]]:
+    """
+    Analyze drift for several models with a single query.
+
+    Args:
+        model_names: Models to analyze
+        threshold: Accuracy drop threshold (default 5%)
+
+    Returns:
+        Dict of model_name -> (latest_run, best_run, has_drifted).
+        Models without runs are omitted.
+    """
+    db: Session = SessionLocal()
+    try:
+        runs = (
+            db.query(Run)
+            .filter(Run.model_name.in_(model_names))
+            .order_by(Run.timestamp.desc())
+            .all()
+        )
+
+        runs_by_model: Dict[str, List[Run]] = {}
+        for run in runs:
+            runs_by_model.setdefault(run.model_name, []).append(run)
+
+        analysis = {}
+        for model_name, model_runs in runs_by_model.items():
+            latest_run = model_runs[0]
+            best_run = max(model_runs, key=lambda r: r.accuracy)
+            accuracy_drop = best_run.accuracy - latest_run.accuracy
+            analysis[model_name] = (latest_run, best_run, accuracy_drop > threshold)
+
+        return analysis
+
+    finally:
+        db.close()
+
+
 def save_rag_run(
     model_name: str,
     results: List[Dict],
@@ -1,10 +1,10 @@
 import os
 import sys
 import csv
-import json
 import time
 import warnings
 import base64
+import orjson
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
@@ -290,11 +290,11 @@ def main():
     # Save results to JSON (backup)
     timestamp = time.strftime("%Y%m%d_%H%M%S")
     output_file = f"evaluation_results_{timestamp}.json"
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump({
+    with open(output_file, "wb") as f:
+        f.write(orjson.dumps({
             "total_evaluation_time": total_elapsed,
             "models": all_results
-        }, f, ensure_ascii=False, indent=2)
+        }, option=orjson.OPT_INDENT_2))
 
     print(f"\n[DONE] Evaluation finished in {total_elapsed:.2f}s.")
     print(f"[JSON] Backup saved to {output_file}")
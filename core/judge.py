@@ -1,6 +1,6 @@
 import json
 import os
-import time
+from functools import lru_cache
 from dotenv import load_dotenv
 from openai import OpenAI
 
@@ -13,11 +13,21 @@ judge_client = OpenAI(
     base_url="http://127.0.0.1:4000"  # LiteLLM proxy endpoint
 )
 
-def score_answer(expected: str, response: str):
+class InvalidJudgeReply(ValueError):
+    """The judge's reply was not the requested JSON."""
+
+
+@lru_cache(maxsize=50000)
+def _judge_cached(expected: str, response: str):
     """
-    Uses GPT-4o-mini via LiteLLM proxy to score a model response.
+    Run the judge prompt for one (expected, response) pair and parse its reply.
+
+    Memoized in-process: judging is deterministic (temperature 0) and many
+    models give the same short answer to a question, so a repeated pair
+    returns the earlier verdict instead of calling the judge again. API
+    errors and malformed replies raise, so they are never cached.
+
     Returns (score: float, reasoning: str)
-    Now uses OpenAI SDK for automatic Phoenix tracing.
     """
 
     prompt = f"""
@@ -31,28 +41,36 @@ Expected answer: {expected}
 Model answer: {response}
 """
 
+    # Use OpenAI SDK - automatically traced by Phoenix
+    completion = judge_client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": "You are a strict evaluator."},
+            {"role": "user", "content": prompt},
+        ],
+        temperature=0.0,
+        max_tokens=200,
+        timeout=25
+    )
+
+    content = completion.choices[0].message.content
+
     try:
-        start_time = time.time()
-
-        # Use OpenAI SDK - automatically traced by Phoenix
-        completion = judge_client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a strict evaluator."},
-                {"role": "user", "content": prompt},
-            ],
-            max_tokens=200,
-            timeout=25
-        )
-
-        elapsed = time.time() - start_time
-        content = completion.choices[0].message.content
-
-        try:
-            parsed = json.loads(content)
-            return float(parsed.get("score", 0.0)), parsed.get("reasoning", "")
-        except:
-            return 0.0, f"Invalid JSON from judge: {content}"
+        parsed = json.loads(content)
+        return float(parsed.get("score", 0.0)), parsed.get("reasoning", "")
+    except Exception as e:
+        raise InvalidJudgeReply(content) from e
+
 
+def score_answer(expected: str, response: str):
+    """
+    Uses GPT-4o-mini via LiteLLM proxy to score a model response.
+    Returns (score: float, reasoning: str)
+    Now uses OpenAI SDK for automatic Phoenix tracing.
+    """
+    try:
+        return _judge_cached(expected, response)
+    except InvalidJudgeReply as e:
+        return 0.0, f"Invalid JSON from judge: {e}"
     except Exception as e:
         return 0.0, f"Exception: {str(e)}"
@@ -5,16 +5,20 @@ Evaluates retrieval quality AND generation quality for RAG systems
 
 import os
 import csv
-import json
 import ast
+import time
 import requests
+import orjson
+import numpy as np
+from collections import defaultdict
+from functools import lru_cache
 from datetime import datetime
 from typing import List, Dict, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from openai import OpenAI
 from dotenv import load_dotenv
 
-from retrieval import RetrievalSystem
+from retrieval import RetrievalSystem, CHUNK_ID_DTYPE
 from db import save_rag_run, init_db
 
 load_dotenv()
@@ -22,6 +26,81 @@ load_dotenv()
 # Initialize database
 init_db()
 
+# LiteLLM proxy health is checked once per process and over a shared session.
+# Set LITELLM_SKIP_HEALTH=1 to skip the check entirely.
+LITELLM_HEALTH_URL = "http://127.0.0.1:4000/health"
+_SESSION = requests.Session()
+_PROXY_CHECKED = False
+
+# orjson handles NumPy scalars from retrieval/summary code without conversion
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+# Fixed instructions go in the system message so every call shares the same
+# prompt prefix (cacheable by the proxy/provider); per-question inputs go in
+# a short user message.
+ANSWER_JUDGE_SYSTEM_PROMPT = """Rate the correctness of the answer compared to the expected answer.
+
+Task:
+1. Check if the answer is factually correct
+2. Allow for paraphrasing and different wording
+3. Rate on a scale of 0-1:
+   - 1.0 = Completely correct
+   - 0.7 = Mostly correct with minor issues
+   - 0.5 = Partially correct
+   - 0.3 = Mostly incorrect
+   - 0.0 = Completely incorrect or irrelevant
+
+Respond ONLY in this format:
+SCORE: <0.0-1.0>
+REASONING: <brief explanation>"""
+
+GROUNDING_JUDGE_SYSTEM_PROMPT = """Evaluate if the answer is grounded in the provided context.
+
+Task:
+1. Check if the answer's key claims can be verified using the context
+2. Identify any hallucinations or information not present in context
+3. Rate grounding on a scale of 0-1:
+   - 1.0 = Fully grounded, all claims supported by context
+   - 0.7 = Mostly grounded, minor details not in context
+   - 0.5 = Partially grounded, some unsupported claims
+   - 0.3 = Poorly grounded, mostly unsupported
+   - 0.0 = Not grounded, hallucinated or irrelevant
+
+Respond ONLY in this format:
+SCORE: <0.0-1.0>
+REASONING: <brief explanation>"""
+
+GENERATION_SYSTEM_PROMPT = (
+    "Answer the question using ONLY the information provided in the context.\n"
+    'If the context does not contain enough information to answer the question, '
+    'say "Not mentioned in the provided context."'
+)
+
+# Judge model used for both answer correctness and grounding
+JUDGE_MODEL = "gpt-4o-mini"
+
+# Judge replies are two short lines (SCORE + REASONING); a blank line means the model is rambling
+JUDGE_MAX_TOKENS = 120
+JUDGE_STOP = ["\n\n"]
+GENERATION_MAX_TOKENS = 350
+
+# Per-question metrics averaged by _compute_summary (column order of its metrics array)
+SUMMARY_METRIC_COLUMNS = (
+    'retrieval_precision',
+    'retrieval_recall',
+    'retrieval_f1',
+    'retrieval_mrr',
+    'answer_score',
+    'grounding_score',
+    'retrieval_time',
+    'generation_time',
+    'total_time'
+)
+
+
+class InvalidJudgeReply(ValueError):
+    """The judge's reply had no parseable SCORE line."""
+
 
 class RAGEvaluator:
     """Complete RAG evaluation pipeline"""
@@ -66,9 +145,14 @@ class RAGEvaluator:
         print(f"  Model: {model}")
 
     def _check_litellm_proxy(self):
-        """Check if LiteLLM proxy is available"""
+        """Check if LiteLLM proxy is available (once per process)"""
+        global _PROXY_CHECKED
+        if _PROXY_CHECKED or os.getenv("LITELLM_SKIP_HEALTH") == "1":
+            return
+        _PROXY_CHECKED = True
+
         try:
-            response = requests.get("http://127.0.0.1:4000/health", timeout=5)
+            response = _SESSION.get(LITELLM_HEALTH_URL, timeout=5)
             if response.status_code == 200:
                 print("[OK] LiteLLM proxy is running")
             else:
@@ -101,7 +185,8 @@ class RAGEvaluator:
                     'category': row['category'],
                     'question': row['input'],
                     'expected_answer': row['expected_output'],
-                    'relevant_chunk_ids': relevant_ids,
+                    # Unique ID array, ready for the compiled retrieval metrics
+                    'relevant_chunk_ids': np.unique(np.asarray(relevant_ids, dtype=CHUNK_ID_DTYPE)),
                     'notes': row.get('notes', '')
                 })
 
@@ -124,9 +209,9 @@ class RAGEvaluator:
         relevant_chunk_ids = question_data['relevant_chunk_ids']
 
         # Step 1: Retrieval
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         retrieved_docs = self.retriever.retrieve(question, top_k=self.retrieval_k)
-        retrieval_time = (datetime.now() - start_time).total_seconds()
+        retrieval_time = time.perf_counter() - start_time
 
         # Evaluate retrieval quality
         retrieval_metrics = self.retriever.evaluate_retrieval(
@@ -139,14 +224,14 @@ class RAGEvaluator:
         context = self.retriever.format_context_for_llm(retrieved_docs)
 
         # Step 3: Generate answer with context
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         generated_answer = self._generate_answer(question, context)
-        generation_time = (datetime.now() - start_time).total_seconds()
+        generation_time = time.perf_counter() - start_time
 
         # Step 4: Judge the answer quality
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         judge_score, judge_reasoning = self._judge_answer(generated_answer, expected_answer)
-        judge_time = (datetime.now() - start_time).total_seconds()
+        judge_time = time.perf_counter() - start_time
 
         # Step 5: Judge answer grounding (does answer use context?)
         grounding_score, grounding_reasoning = self._judge_grounding(
@@ -184,75 +269,81 @@ class RAGEvaluator:
             'grounding_reasoning': grounding_reasoning,
 
             # Total
-            'total_time': round(retrieval_time + generation_time + judge_time, 3),
-
-            # Retrieved context (for debugging)
-            'retrieved_docs': retrieved_docs if save_traces else None
+            'total_time': round(retrieval_time + generation_time + judge_time, 3)
         }
 
+        # Retrieved context (for debugging)
+        if save_traces:
+            result['retrieved_docs'] = self.retriever.materialize_results(retrieved_docs)
+
         return result
 
-    def _judge_answer(self, answer: str, expected_answer: str) -> tuple[float, str]:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _judge_cached(client: OpenAI, model: str, system_prompt: str, prompt: str) -> tuple[float, str]:
         """
-        Judge answer quality against expected answer
+        Run a judge prompt and parse its SCORE/REASONING reply
+
+        Memoized in-process: judging is deterministic (temperature 0), so a
+        repeated (system prompt, inputs) pair returns the earlier verdict.
+        API errors and replies without a valid SCORE raise (InvalidJudgeReply),
+        so they propagate to the caller and are never cached.
 
         Returns:
             (score, reasoning)
         """
-        prompt = f"""Rate the correctness of the answer compared to the expected answer.
-
-Expected answer: {expected_answer}
-Model answer: {answer}
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.0,
+            max_tokens=JUDGE_MAX_TOKENS,
+            stop=JUDGE_STOP
+        )
 
-Task:
-1. Check if the answer is factually correct
-2. Allow for paraphrasing and different wording
-3. Rate on a scale of 0-1:
-   - 1.0 = Completely correct
-   - 0.7 = Mostly correct with minor issues
-   - 0.5 = Partially correct
-   - 0.3 = Mostly incorrect
-   - 0.0 = Completely incorrect or irrelevant
+        content = response.choices[0].message.content.strip()
 
-Respond ONLY in this format:
-SCORE: <0.0-1.0>
-REASONING: <brief explanation>"""
+        # Parse response
+        lines = content.split('\n')
+        score = None
+        reasoning = ""
 
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.0,
-                max_tokens=300
-            )
+        for line in lines:
+            if line.startswith('SCORE:'):
+                try:
+                    score = float(line.split('SCORE:')[1].strip())
+                except ValueError:
+                    score = None
+            elif line.startswith('REASONING:'):
+                reasoning = line.split('REASONING:')[1].strip()
 
-            content = response.choices[0].message.content.strip()
+        if score is None:
+            raise InvalidJudgeReply(content)
 
-            # Parse response
-            lines = content.split('\n')
-            score = 0.0
-            reasoning = ""
+        return score, reasoning
 
-            for line in lines:
-                if line.startswith('SCORE:'):
-                    try:
-                        score = float(line.split('SCORE:')[1].strip())
-                    except:
-                        score = 0.0
-                elif line.startswith('REASONING:'):
-                    reasoning = line.split('REASONING:')[1].strip()
+    def _judge_answer(self, answer: str, expected_answer: str) -> tuple[float, str]:
+        """
+        Judge answer quality against expected answer
 
-            return score, reasoning
+        Returns:
+            (score, reasoning)
+        """
+        prompt = f"""Expected answer: {expected_answer}
+Model answer: {answer}"""
 
+        try:
+            return self._judge_cached(self.client, JUDGE_MODEL, ANSWER_JUDGE_SYSTEM_PROMPT, prompt)
+        except InvalidJudgeReply as e:
+            return 0.0, f"Invalid judge reply: {e}"
         except Exception as e:
             return 0.0, f"Error judging answer: {str(e)}"
 
     def _generate_answer(self, question: str, context: str) -> str:
         """Generate answer using retrieved context"""
-        prompt = f"""Answer the question using ONLY the information provided in the context below.
-If the context does not contain enough information to answer the question, say "Not mentioned in the provided context."
-
-Context:
+        prompt = f"""Context:
 {context}
 
 Question: {question}
@@ -262,9 +353,12 @@ Answer:"""
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[{"role": "user", "content": prompt}],
+                messages=[
+                    {"role": "system", "content": GENERATION_SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt}
+                ],
                 temperature=0.0,
-                max_tokens=500
+                max_tokens=GENERATION_MAX_TOKENS
             )
             return response.choices[0].message.content.strip()
         except Exception as e:
@@ -282,55 +376,17 @@ Answer:"""
         Returns:
             (grounding_score, reasoning)
         """
-        prompt = f"""Evaluate if the answer is grounded in the provided context.
-
-Question: {question}
+        prompt = f"""Question: {question}
 
 Context:
 {context}
 
-Answer: {answer}
-
-Task:
-1. Check if the answer's key claims can be verified using the context
-2. Identify any hallucinations or information not present in context
-3. Rate grounding on a scale of 0-1:
-   - 1.0 = Fully grounded, all claims supported by context
-   - 0.7 = Mostly grounded, minor details not in context
-   - 0.5 = Partially grounded, some unsupported claims
-   - 0.3 = Poorly grounded, mostly unsupported
-   - 0.0 = Not grounded, hallucinated or irrelevant
-
-Respond ONLY in this format:
-SCORE: <0.0-1.0>
-REASONING: <brief explanation>"""
+Answer: {answer}"""
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",  # Use same judge model
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.0,
-                max_tokens=300
-            )
-
-            content = response.choices[0].message.content.strip()
-
-            # Parse response
-            lines = content.split('\n')
-            score = 0.0
-            reasoning = ""
-
-            for line in lines:
-                if line.startswith('SCORE:'):
-                    try:
-                        score = float(line.split('SCORE:')[1].strip())
-                    except:
-                        score = 0.0
-                elif line.startswith('REASONING:'):
-                    reasoning = line.split('REASONING:')[1].strip()
-
-            return score, reasoning
-
+            return self._judge_cached(self.client, JUDGE_MODEL, GROUNDING_JUDGE_SYSTEM_PROMPT, prompt)
+        except InvalidJudgeReply as e:
+            return 0.0, f"Invalid judge reply: {e}"
         except Exception as e:
             return 0.0, f"Error judging grounding: {str(e)}"
 
@@ -360,33 +416,22 @@ REASONING: <brief explanation>"""
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
 
+        # Per-question results are streamed to JSONL as they complete; only the
+        # slim records (without retrieved document traces) stay in memory for
+        # the summary and database save.
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        results_file = f"{output_dir}/rag_eval_{self.model}_{timestamp}.jsonl"
+        summary_file = f"{output_dir}/rag_eval_{self.model}_{timestamp}_summary.json"
+
         results = []
-        start_time = datetime.now()
-
-        if parallel:
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = {
-                    executor.submit(self.evaluate_single_question, q): q
-                    for q in self.questions
-                }
-
-                for i, future in enumerate(as_completed(futures), 1):
-                    try:
-                        result = future.result()
-                        results.append(result)
-                        print(f"[{i}/{len(self.questions)}] Q{result['question_id']}: "
-                              f"Retrieval P={result['retrieval_precision']:.2f} "
-                              f"R={result['retrieval_recall']:.2f} | "
-                              f"Answer={result['answer_score']:.2f} "
-                              f"Grounding={result['grounding_score']:.2f}")
-                    except Exception as e:
-                        question_data = futures[future]
-                        print(f"[ERROR] Q{question_data['id']} failed: {str(e)}")
-                        print(f"[INFO] Continuing with remaining questions...")
-                        # Continue processing other questions
-        else:
-            for i, question_data in enumerate(self.questions, 1):
-                result = self.evaluate_single_question(question_data)
+        start_time = time.perf_counter()
+
+        with open(results_file, 'wb') as results_out:
+
+            def record(i: int, result: Dict):
+                results_out.write(orjson.dumps(result, option=ORJSON_OPTIONS) + b'\n')
+                results_out.flush()
+                result.pop('retrieved_docs', None)
                 results.append(result)
                 print(f"[{i}/{len(self.questions)}] Q{result['question_id']}: "
                       f"Retrieval P={result['retrieval_precision']:.2f} "
@@ -394,7 +439,26 @@ REASONING: <brief explanation>"""
                       f"Answer={result['answer_score']:.2f} "
                       f"Grounding={result['grounding_score']:.2f}")
 
-        evaluation_time = (datetime.now() - start_time).total_seconds()
+            if parallel:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {
+                        executor.submit(self.evaluate_single_question, q): q
+                        for q in self.questions
+                    }
+
+                    for i, future in enumerate(as_completed(futures), 1):
+                        try:
+                            record(i, future.result())
+                        except Exception as e:
+                            question_data = futures[future]
+                            print(f"[ERROR] Q{question_data['id']} failed: {str(e)}")
+                            print(f"[INFO] Continuing with remaining questions...")
+                            # Continue processing other questions
+            else:
+                for i, question_data in enumerate(self.questions, 1):
+                    record(i, self.evaluate_single_question(question_data))
+
+        evaluation_time = time.perf_counter() - start_time
 
         # Compute summary statistics
         summary = self._compute_summary(results)
@@ -412,20 +476,17 @@ REASONING: <brief explanation>"""
             except Exception as e:
                 print(f"\n[WARNING] Failed to save to database: {e}")
 
-        # Save results to JSON
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        results_file = f"{output_dir}/rag_eval_{self.model}_{timestamp}.json"
-
-        with open(results_file, 'w', encoding='utf-8') as f:
-            json.dump({
+        # Save summary to JSON
+        with open(summary_file, 'wb') as f:
+            f.write(orjson.dumps({
                 'model': self.model,
                 'retrieval_k': self.retrieval_k,
                 'timestamp': timestamp,
-                'summary': summary,
-                'results': results
-            }, f, indent=2, ensure_ascii=False)
+                'summary': summary
+            }, option=ORJSON_OPTIONS | orjson.OPT_INDENT_2))
 
         print(f"\n[OK] Results saved to {results_file}")
+        print(f"[OK] Summary saved to {summary_file}")
 
         return summary
 
@@ -434,51 +495,34 @@ REASONING: <brief explanation>"""
         if not results:
             return {}
 
-        # Retrieval metrics
-        avg_precision = sum(r['retrieval_precision'] for r in results) / len(results)
-        avg_recall = sum(r['retrieval_recall'] for r in results) / len(results)
-        avg_f1 = sum(r['retrieval_f1'] for r in results) / len(results)
-        avg_mrr = sum(r['retrieval_mrr'] for r in results) / len(results)
-
-        # Answer metrics
-        avg_answer_score = sum(r['answer_score'] for r in results) / len(results)
-        avg_grounding = sum(r['grounding_score'] for r in results) / len(results)
-
-        # Time metrics
-        avg_retrieval_time = sum(r['retrieval_time'] for r in results) / len(results)
-        avg_generation_time = sum(r['generation_time'] for r in results) / len(results)
-        avg_total_time = sum(r['total_time'] for r in results) / len(results)
-
-        # Category breakdown
+        # Load every metric into one (N, 9) array so each mean is a single C-level reduction
+        metrics = np.array(
+            [[r[name] for name in SUMMARY_METRIC_COLUMNS] for r in results],
+            dtype=np.float64
+        )
+        means = metrics.mean(axis=0)
+        (
+            avg_precision, avg_recall, avg_f1, avg_mrr,
+            avg_answer_score, avg_grounding,
+            avg_retrieval_time, avg_generation_time, avg_total_time
+        ) = (float(m) for m in means)
+
+        # Category breakdown: bucket row indices, then average each bucket's rows
+        category_rows = defaultdict(list)
+        for i, result in enumerate(results):
+            category_rows[result['category']].append(i)
+
+        col = {name: i for i, name in enumerate(SUMMARY_METRIC_COLUMNS)}
         category_stats = {}
-        for result in results:
-            cat = result['category']
-            if cat not in category_stats:
-                category_stats[cat] = {
-                    'count': 0,
-                    'retrieval_precision': [],
-                    'retrieval_recall': [],
-                    'answer_score': [],
-                    'grounding_score': []
-                }
-            category_stats[cat]['count'] += 1
-            category_stats[cat]['retrieval_precision'].append(result['retrieval_precision'])
-            category_stats[cat]['retrieval_recall'].append(result['retrieval_recall'])
-            category_stats[cat]['answer_score'].append(result['answer_score'])
-            category_stats[cat]['grounding_score'].append(result['grounding_score'])
-
-        # Compute category averages
-        for cat in category_stats:
-            stats = category_stats[cat]
-            stats['avg_retrieval_precision'] = sum(stats['retrieval_precision']) / stats['count']
-            stats['avg_retrieval_recall'] = sum(stats['retrieval_recall']) / stats['count']
-            stats['avg_answer_score'] = sum(stats['answer_score']) / stats['count']
-            stats['avg_grounding_score'] = sum(stats['grounding_score']) / stats['count']
-            # Remove raw lists to reduce output size
-            del stats['retrieval_precision']
-            del stats['retrieval_recall']
-            del stats['answer_score']
-            del stats['grounding_score']
+        for cat, rows in category_rows.items():
+            cat_means = metrics[rows].mean(axis=0)
+            category_stats[cat] = {
+                'count': len(rows),
+                'avg_retrieval_precision': float(cat_means[col['retrieval_precision']]),
+                'avg_retrieval_recall': float(cat_means[col['retrieval_recall']]),
+                'avg_answer_score': float(cat_means[col['answer_score']]),
+                'avg_grounding_score': float(cat_means[col['grounding_score']])
+            }
 
         summary = {
             'total_questions': len(results),
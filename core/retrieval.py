@@ -6,11 +6,111 @@ Implements semantic search over knowledge base using sentence transformers
 import json
 import os
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
 import pickle
 
+try:
+    import faiss
+except ImportError:  # FAISS is optional; fall back to a NumPy scan
+    faiss = None
+
+try:
+    import onnxruntime as ort
+    from transformers import AutoTokenizer
+except ImportError:  # ONNX Runtime is optional; fall back to the PyTorch encoder
+    ort = None
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; metrics then run as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# Above this many documents, use an approximate HNSW graph instead of an exact flat index
+HNSW_MIN_DOCUMENTS = 10_000
+
+# Quantized encoder produced by scripts/export_onnx_encoder.py
+DEFAULT_ONNX_DIR = "data/onnx_minilm"
+ONNX_MODEL_FILE = "model_int8.onnx"
+
+# dtype for chunk ID arrays passed to _retrieval_metrics
+CHUNK_ID_DTYPE = np.int32
+
+
+@njit(cache=True, nogil=True)
+def _retrieval_metrics(retrieved: np.ndarray, relevant: np.ndarray, k: int) -> Tuple[float, float, float, float, int]:
+    """
+    Compute (precision@k, recall@k, f1@k, mrr, true_positives)
+
+    Both arrays must hold unique chunk IDs. Compiled with nogil so parallel
+    evaluation threads don't serialize on the GIL.
+    """
+    tp = 0
+    mrr = 0.0
+    for i in range(len(retrieved)):
+        for j in range(len(relevant)):
+            if retrieved[i] == relevant[j]:
+                tp += 1
+                if mrr == 0.0:
+                    mrr = 1.0 / (i + 1)
+                break
+
+    precision = tp / k if k > 0 else 0.0
+    recall = tp / len(relevant) if len(relevant) > 0 else 0.0
+    f1 = (2 * precision * recall) / (precision + recall) if (precision + recall) > 0 else 0.0
+    return precision, recall, f1, mrr, tp
+
+
+class OnnxSentenceEncoder:
+    """
+    INT8-quantized ONNX Runtime encoder with a SentenceTransformer-style encode()
+
+    Runs the exported transformer and applies the same mean pooling as the
+    sentence-transformers MiniLM models, without PyTorch on the query path.
+    """
+
+    def __init__(self, model_dir: str):
+        model_dir = Path(model_dir)
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_dir))
+        self.session = ort.InferenceSession(
+            str(model_dir / ONNX_MODEL_FILE),
+            providers=['CPUExecutionProvider']
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False
+    ) -> np.ndarray:
+        """Encode texts into a (len(texts), dim) float32 array"""
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            tokens = self.tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                return_tensors='np'
+            )
+            inputs = {name: value for name, value in tokens.items() if name in self.input_names}
+            token_embeddings = self.session.run(None, inputs)[0]
+
+            # Mean pooling over non-padding tokens
+            mask = tokens['attention_mask'][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            batches.append(pooled)
+
+        embeddings = np.vstack(batches).astype(np.float32)
+        if normalize_embeddings:
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-10
+        return embeddings
+
 
 class RetrievalSystem:
     """Vector-based retrieval system for RAG evaluation"""
@@ -19,7 +119,9 @@ class RetrievalSystem:
         self,
         knowledge_base_path: str = "data/knowledge_base.json",
         model_name: str = "all-MiniLM-L6-v2",
-        cache_dir: str = "data/embeddings"
+        cache_dir: str = "data/embeddings",
+        device: Optional[str] = None,
+        onnx_model_dir: str = DEFAULT_ONNX_DIR
     ):
         """
         Initialize retrieval system
@@ -28,6 +130,9 @@ class RetrievalSystem:
             knowledge_base_path: Path to knowledge base JSON
             model_name: HuggingFace sentence transformer model
             cache_dir: Directory to cache embeddings
+            device: Torch device for the encoder (default: cuda if available, else cpu)
+            onnx_model_dir: Directory with an exported INT8 ONNX encoder; used
+                instead of PyTorch on CPU when present and onnxruntime is installed
         """
         self.knowledge_base_path = knowledge_base_path
         self.model_name = model_name
@@ -36,14 +141,28 @@ class RetrievalSystem:
 
         # Load knowledge base
         self.documents = self._load_knowledge_base()
+        self._by_id = {doc['chunk_id']: doc for doc in self.documents}
 
         # Initialize embedding model
-        print(f"Loading embedding model: {model_name}...")
-        self.model = SentenceTransformer(model_name)
+        self.device = device or ('cuda' if torch.cuda.is_available() else 'cpu')
+        onnx_model_path = Path(onnx_model_dir) / ONNX_MODEL_FILE
+        self.use_onnx = ort is not None and self.device == 'cpu' and onnx_model_path.exists()
+        if self.use_onnx:
+            print(f"Loading embedding model: {onnx_model_path} (ONNX Runtime, int8)...")
+            self.model = OnnxSentenceEncoder(onnx_model_dir)
+        else:
+            print(f"Loading embedding model: {model_name} ({self.device})...")
+            self.model = SentenceTransformer(model_name, device=self.device)
+            if self.device == 'cuda':
+                # FP16 doubles encoder throughput on tensor cores; cosine ranking is unaffected
+                self.model.half()
 
         # Load or create embeddings
         self.embeddings = self._load_or_create_embeddings()
 
+        # Build similarity index once so queries don't rescan every embedding
+        self.index = self._build_index()
+
         print(f"[OK] Retrieval system initialized with {len(self.documents)} documents")
 
     def _load_knowledge_base(self) -> List[Dict]:
@@ -54,9 +173,11 @@ class RetrievalSystem:
 
     def _get_cache_path(self) -> Path:
         """Get path to cached embeddings"""
-        # Include model name in cache filename
+        # Include model name (and backend) in cache filename so query and
+        # document embeddings always come from the same encoder
         safe_model_name = self.model_name.replace('/', '_')
-        return self.cache_dir / f"embeddings_{safe_model_name}.pkl"
+        suffix = "_onnx_int8" if self.use_onnx else ""
+        return self.cache_dir / f"embeddings_{safe_model_name}{suffix}.pkl"
 
     def _load_or_create_embeddings(self) -> np.ndarray:
         """Load embeddings from cache or create new ones"""
@@ -79,9 +200,11 @@ class RetrievalSystem:
         texts = [doc['content'] for doc in self.documents]
         embeddings = self.model.encode(
             texts,
+            batch_size=256,
             show_progress_bar=True,
-            convert_to_numpy=True
-        )
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        ).astype(np.float32)
 
         # Cache for future use
         with open(cache_path, 'wb') as f:
@@ -90,6 +213,43 @@ class RetrievalSystem:
 
         return embeddings
 
+    def _build_index(self):
+        """
+        Build an inner-product index over L2-normalized embeddings
+
+        On normalized vectors inner product equals cosine similarity, so the
+        index returns the same scores as the previous exhaustive scan.
+        Returns None when FAISS is not installed.
+        """
+        norms = np.linalg.norm(self.embeddings, axis=1, keepdims=True) + 1e-10
+        self._normalized_embeddings = (self.embeddings / norms).astype(np.float32)
+
+        if faiss is None:
+            return None
+
+        dim = self._normalized_embeddings.shape[1]
+        if len(self._normalized_embeddings) >= HNSW_MIN_DOCUMENTS:
+            index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = 200
+        else:
+            index = faiss.IndexFlatIP(dim)
+        index.add(self._normalized_embeddings)
+        return index
+
+    def _search(self, query_embedding: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (scores, indices) of the top-k documents for a query embedding"""
+        query = query_embedding.astype(np.float32).reshape(1, -1)
+        query /= np.linalg.norm(query) + 1e-10
+        top_k = min(top_k, len(self.documents))
+
+        if self.index is not None:
+            scores, indices = self.index.search(query, top_k)
+            return scores[0], indices[0]
+
+        similarities = self._normalized_embeddings @ query[0]
+        indices = np.argsort(similarities)[::-1][:top_k]
+        return similarities[indices], indices
+
     def retrieve(
         self,
         query: str,
@@ -103,47 +263,43 @@ class RetrievalSystem:
             top_k: Number of documents to retrieve
 
         Returns:
-            List of dicts with keys: chunk_id, content, domain, topic, score
+            List of dicts with keys: chunk_id, score, rank. Use
+            get_document_by_id() or materialize_results() for document content.
         """
         # Encode query
         query_embedding = self.model.encode([query], convert_to_numpy=True)[0]
 
-        # Compute cosine similarity
-        similarities = self._cosine_similarity(query_embedding, self.embeddings)
-
-        # Get top-k indices
-        top_indices = np.argsort(similarities)[::-1][:top_k]
+        # Top-k by cosine similarity
+        scores, top_indices = self._search(query_embedding, top_k)
 
         # Build results
         results = []
-        for idx in top_indices:
-            doc = self.documents[idx].copy()
-            doc['score'] = float(similarities[idx])
-            doc['rank'] = len(results) + 1
-            results.append(doc)
+        for score, idx in zip(scores, top_indices):
+            if idx < 0:  # FAISS pads with -1 when fewer than top_k hits
+                continue
+            results.append({
+                'chunk_id': self.documents[idx]['chunk_id'],
+                'score': float(score),
+                'rank': len(results) + 1
+            })
 
         return results
 
-    def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> np.ndarray:
-        """Compute cosine similarity between vector and matrix"""
-        # Normalize vectors
-        vec1_norm = vec1 / (np.linalg.norm(vec1) + 1e-10)
-        vec2_norm = vec2 / (np.linalg.norm(vec2, axis=1, keepdims=True) + 1e-10)
-
-        # Compute dot product
-        return np.dot(vec2_norm, vec1_norm)
+    def materialize_results(self, retrieved_docs: List[Dict]) -> List[Dict]:
+        """Expand lightweight retrieve() results into full document dicts with score and rank"""
+        return [{**self._by_id[hit['chunk_id']], **hit} for hit in retrieved_docs]
 
     def get_document_by_id(self, chunk_id: int) -> Dict:
         """Get document by chunk_id"""
-        for doc in self.documents:
-            if doc['chunk_id'] == chunk_id:
-                return doc
-        raise ValueError(f"Document with chunk_id {chunk_id} not found")
+        try:
+            return self._by_id[chunk_id]
+        except KeyError:
+            raise ValueError(f"Document with chunk_id {chunk_id} not found")
 
     def evaluate_retrieval(
         self,
         query: str,
-        relevant_chunk_ids: List[int],
+        relevant_chunk_ids: Union[List[int], np.ndarray],
         top_k: int = 5
     ) -> Dict[str, float]:
         """
@@ -161,28 +317,12 @@ class RetrievalSystem:
         results = self.retrieve(query, top_k=top_k)
         retrieved_ids = [doc['chunk_id'] for doc in results]
 
-        # Convert to sets for evaluation
-        relevant_set = set(relevant_chunk_ids)
-        retrieved_set = set(retrieved_ids)
-
-        # True positives
-        tp = len(relevant_set & retrieved_set)
-
-        # Precision@K
-        precision = tp / top_k if top_k > 0 else 0.0
-
-        # Recall@K
-        recall = tp / len(relevant_set) if len(relevant_set) > 0 else 0.0
-
-        # F1@K
-        f1 = (2 * precision * recall) / (precision + recall) if (precision + recall) > 0 else 0.0
-
-        # Mean Reciprocal Rank (MRR)
-        mrr = 0.0
-        for rank, chunk_id in enumerate(retrieved_ids, start=1):
-            if chunk_id in relevant_set:
-                mrr = 1.0 / rank
-                break
+        relevant = np.unique(np.asarray(relevant_chunk_ids, dtype=CHUNK_ID_DTYPE))
+        precision, recall, f1, mrr, tp = _retrieval_metrics(
+            np.asarray(retrieved_ids, dtype=CHUNK_ID_DTYPE),
+            relevant,
+            top_k
+        )
 
         # Average relevance score
         avg_score = np.mean([doc['score'] for doc in results]) if results else 0.0
@@ -194,14 +334,15 @@ class RetrievalSystem:
             'mrr': round(mrr, 4),
             'avg_similarity_score': round(float(avg_score), 4),
             'retrieved_chunk_ids': retrieved_ids,
-            'true_positives': tp,
-            'total_relevant': len(relevant_set)
+            'true_positives': int(tp),
+            'total_relevant': len(relevant)
         }
 
     def format_context_for_llm(self, retrieved_docs: List[Dict]) -> str:
         """Format retrieved documents as context for LLM"""
         context_parts = []
-        for i, doc in enumerate(retrieved_docs, start=1):
+        for i, hit in enumerate(retrieved_docs, start=1):
+            doc = self._by_id[hit['chunk_id']]
             context_parts.append(
                 f"[Document {i}]\n"
                 f"Topic: {doc['topic']} ({doc['domain']})\n"
@@ -231,7 +372,7 @@ def test_retrieval_system():
         print(f"[GROUND TRUTH] {relevant_ids}")
 
         # Retrieve
-        results = retriever.retrieve(query, top_k=3)
+        results = retriever.materialize_results(retriever.retrieve(query, top_k=3))
 
         print(f"\n[TOP 3 RESULTS]")
         for doc in results:
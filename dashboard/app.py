@@ -3,12 +3,11 @@ Eval Dashboard - Main App
 Streamlit dashboard for AI model evaluation tracking and drift detection.
 """
 import streamlit as st
-import sys
-import os
+import time
 
-# Add utils to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'utils'))
-from theme_manager import apply_theme, render_theme_toggle
+# Streamlit puts this script's directory on sys.path, so utils/ imports as a package
+from utils.theme_manager import apply_theme, render_theme_toggle
+from utils.api_client import get_http_session
 
 # Page configuration
 st.set_page_config(
@@ -47,17 +46,59 @@ st.subheader("🔌 System Status")
 
 import requests
 
+API_URL = "http://127.0.0.1:8000"
+PHOENIX_URL = "http://localhost:6006"
+
+# (connect, read) timeouts: a dead local service refuses or times out fast
+API_TIMEOUT = (0.3, 15)
+PHOENIX_TIMEOUT = (0.3, 0.5)
+
+# Default seconds between health probes
+DEFAULT_HEALTH_TTL = 10
+
+
 def check_api_status():
     try:
-        response = requests.get("http://127.0.0.1:8000/health", timeout=15)
+        response = get_http_session().get(f"{API_URL}/health", timeout=API_TIMEOUT)
         if response.status_code == 200:
             data = response.json()
             return True, data
         return False, None
-    except:
+    except requests.RequestException:
         return False, None
 
-api_up, health_data = check_api_status()
+
+def check_phoenix_status():
+    try:
+        return get_http_session().get(PHOENIX_URL, timeout=PHOENIX_TIMEOUT).status_code == 200
+    except requests.RequestException:
+        return False
+
+
+@st.cache_data(ttl=300, max_entries=4, show_spinner=False)
+def probe_services(interval_bucket: int) -> dict:
+    """
+    Probe API and Phoenix; cached so reruns reuse recent results.
+
+    interval_bucket only keys the cache: it changes once per refresh
+    interval, which triggers a fresh probe.
+    """
+    api_up, health_data = check_api_status()
+    return {"api": api_up, "health": health_data, "phoenix": check_phoenix_status()}
+
+
+health_ttl = st.sidebar.slider(
+    "Health refresh interval (s)",
+    min_value=5,
+    max_value=60,
+    value=st.session_state.get("health_ttl", DEFAULT_HEALTH_TTL),
+    step=5,
+    help="How long status checks are reused before probing the services again"
+)
+st.session_state["health_ttl"] = health_ttl
+
+status = probe_services(int(time.time() // health_ttl))
+api_up, health_data = status["api"], status["health"]
 
 col1, col2, col3, col4 = st.columns(4)
 
@@ -89,16 +130,10 @@ with col3:
         st.warning("⚠️ LiteLLM: Unknown")
 
 with col4:
-    # Check Phoenix status
-    try:
-        phoenix_response = requests.get("http://localhost:6006", timeout=2)
-        if phoenix_response.status_code == 200:
-            st.success("✅ Phoenix: Online")
-            st.caption("[View Traces](http://localhost:6006)")
-        else:
-            st.info("ℹ️ Phoenix: Offline")
-            st.caption("Auto-starts with evaluations")
-    except:
+    if status["phoenix"]:
+        st.success("✅ Phoenix: Online")
+        st.caption(f"[View Traces]({PHOENIX_URL})")
+    else:
         st.info("ℹ️ Phoenix: Offline")
         st.caption("Auto-starts with evaluations")
 
@@ -106,7 +141,7 @@ with col4:
 if api_up:
     st.subheader("📊 Quick Stats")
     try:
-        stats_response = requests.get("http://127.0.0.1:8000/stats", timeout=5)
+        stats_response = get_http_session().get(f"{API_URL}/stats", timeout=5)
         if stats_response.status_code == 200:
             stats = stats_response.json()
 
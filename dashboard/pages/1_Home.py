@@ -4,14 +4,10 @@ Shows model performance trends and alerts for accuracy degradation.
 """
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
 from datetime import datetime
-import sys
-import os
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.api_client import get_api_client
+from utils.api_client import APIError
+from utils.cache import get_runs_df, load_drift_batch, render_refresh_button
 from utils.theme_manager import apply_theme, render_theme_toggle, get_plotly_template, apply_plot_theme
 
 # Page config
@@ -24,9 +20,6 @@ st.title("📈 Home - Model Performance Tracker")
 st.markdown("Track accuracy trends and catch drift before it impacts production")
 st.divider()
 
-# Get API client
-api = get_api_client()
-
 # Sidebar filters
 st.sidebar.header("Filters")
 threshold = st.sidebar.slider(
@@ -37,33 +30,19 @@ threshold = st.sidebar.slider(
     help="Alert when accuracy drops by this percentage"
 )
 
-# Fetch all runs (API max page_size is 100, so fetch multiple pages if needed)
+render_refresh_button()
+
+# Fetch all runs (shared with the other pages for this session)
 with st.spinner("Loading evaluation data..."):
-    all_runs = []
-    page = 1
-    while True:
-        runs_data = api.get_runs(page=page, page_size=100)
-        if not runs_data or not runs_data.get("runs"):
-            break
-        all_runs.extend(runs_data["runs"])
-        if len(runs_data["runs"]) < 100:  # Last page
-            break
-        page += 1
-
-    runs_data = {"runs": all_runs, "total": len(all_runs)}
-
-if not runs_data or not runs_data.get("runs"):
+    runs_df = get_runs_df()
+
+if runs_df.empty:
     st.warning("No evaluation runs found. Run an evaluation first!")
     st.info("Start an evaluation: `python core/evaluate.py`")
     st.stop()
 
-# Convert to DataFrame
-runs_df = pd.DataFrame(runs_data["runs"])
-runs_df['timestamp'] = pd.to_datetime(runs_df['timestamp'])
-runs_df = runs_df.sort_values('timestamp')
-
 # Get unique models
-available_models = sorted(runs_df['model_name'].unique())
+available_models = list(runs_df['model_name'].cat.categories)
 
 # Model selector
 selected_models = st.sidebar.multiselect(
@@ -75,20 +54,31 @@ selected_models = st.sidebar.multiselect(
 
 # Filter data by selected models
 if selected_models:
-    filtered_df = runs_df[runs_df['model_name'].isin(selected_models)]
+    filtered_df = runs_df[runs_df['model_name'].isin(selected_models)].copy()
 else:
     st.warning("Please select at least one model to display")
     st.stop()
 
+# Parse and sort only the selected models' rows; API timestamps are ISO 8601
+filtered_df['timestamp'] = pd.to_datetime(filtered_df['timestamp'], format='ISO8601')
+filtered_df = filtered_df.sort_values('timestamp')
+
 # Drift Analysis Section
 st.header("🚨 Drift Detection Alerts")
 
 drift_cols = st.columns(len(selected_models))
 drift_threshold = threshold / 100.0  # Convert to decimal
 
+# One batched request for every selected model (failures raise, so they are never cached)
+try:
+    drift_map = load_drift_batch(tuple(selected_models), drift_threshold)
+except APIError as e:
+    st.error(f"API Error: {e}")
+    drift_map = {}
+
 for idx, model in enumerate(selected_models):
     with drift_cols[idx]:
-        drift_data = api.get_drift(model, threshold=drift_threshold)
+        drift_data = drift_map.get(model)
 
         if drift_data:
             has_drifted = drift_data.get("has_drifted", False)
@@ -121,58 +111,72 @@ st.divider()
 # Accuracy Over Time Chart
 st.header("📊 Accuracy Trends Over Time")
 
-# Create interactive line chart with Plotly
-fig = go.Figure()
-
-for model in selected_models:
-    model_data = filtered_df[filtered_df['model_name'] == model]
-
-    fig.add_trace(go.Scatter(
-        x=model_data['timestamp'],
-        y=model_data['accuracy'],
-        mode='lines+markers',
-        name=model,
-        line=dict(width=2),
-        marker=dict(size=8),
-        hovertemplate=(
-            f"<b>{model}</b><br>" +
-            "Accuracy: %{y:.1%}<br>" +
-            "Date: %{x|%Y-%m-%d %H:%M}<br>" +
-            "<extra></extra>"
+@st.cache_data(ttl=60, show_spinner=False)
+def build_accuracy_figure(filtered_df, selected_models, drift_threshold, threshold):
+    """
+    Build the interactive accuracy-over-time line chart (Plotly imported on first use).
+
+    Cached on the filtered data and selections, so reruns from unrelated widgets
+    reuse the figure. Theming is applied by the caller since it depends on the
+    session's dark-mode toggle.
+    """
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+
+    for model in selected_models:
+        model_data = filtered_df[filtered_df['model_name'] == model]
+
+        # WebGL traces stay responsive with many runs per model
+        fig.add_trace(go.Scattergl(
+            x=model_data['timestamp'],
+            y=model_data['accuracy'],
+            mode='lines+markers',
+            name=model,
+            line=dict(width=1.5),
+            marker=dict(size=6),
+            hovertemplate=(
+                f"<b>{model}</b><br>" +
+                "Accuracy: %{y:.1%}<br>" +
+                "Date: %{x|%Y-%m-%d %H:%M}<br>" +
+                "<extra></extra>"
+            )
+        ))
+
+    # Add threshold line for reference
+    if not filtered_df.empty:
+        max_accuracy = filtered_df['accuracy'].max()
+        threshold_line = max_accuracy * (1 - drift_threshold)
+
+        fig.add_hline(
+            y=threshold_line,
+            line_dash="dash",
+            line_color="red",
+            annotation_text=f"Drift Threshold (-{threshold}%)",
+            annotation_position="right"
         )
-    ))
-
-# Add threshold line for reference
-if not filtered_df.empty:
-    max_accuracy = filtered_df['accuracy'].max()
-    threshold_line = max_accuracy * (1 - drift_threshold)
-
-    fig.add_hline(
-        y=threshold_line,
-        line_dash="dash",
-        line_color="red",
-        annotation_text=f"Drift Threshold (-{threshold}%)",
-        annotation_position="right"
-    )
 
-# Update layout
-fig.update_layout(
-    xaxis_title="Timestamp",
-    yaxis_title="Accuracy",
-    yaxis_tickformat=".0%",
-    hovermode='x unified',
-    height=500,
-    legend=dict(
-        orientation="h",
-        yanchor="bottom",
-        y=1.02,
-        xanchor="right",
-        x=1
+    # Update layout
+    fig.update_layout(
+        xaxis_title="Timestamp",
+        yaxis_title="Accuracy",
+        yaxis_tickformat=".0%",
+        hovermode='x unified',
+        height=500,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
     )
-)
 
-apply_plot_theme(fig)
+    return fig
 
+
+fig = build_accuracy_figure(filtered_df, tuple(selected_models), drift_threshold, threshold)
+apply_plot_theme(fig)
 st.plotly_chart(fig, use_container_width=True, theme=None)
 
 # Summary Statistics
@@ -202,26 +206,27 @@ with col4:
 # Recent Runs Table
 st.header("🕒 Recent Evaluation Runs")
 
-# Display table of recent runs
-recent_runs = filtered_df.nlargest(10, 'timestamp')[
+# Display table of recent runs (filtered_df is already sorted by timestamp)
+recent_runs = filtered_df.iloc[-10:][
     ['model_name', 'accuracy', 'avg_latency', 'total_cost', 'timestamp', 'id']
-].copy()
-
-recent_runs['timestamp'] = recent_runs['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S')
-recent_runs['accuracy'] = recent_runs['accuracy'].apply(lambda x: f"{x:.1%}")
-recent_runs['avg_latency'] = recent_runs['avg_latency'].apply(lambda x: f"{x:.2f}s")
-recent_runs['total_cost'] = recent_runs['total_cost'].apply(lambda x: f"${x:.4f}")
-
-recent_runs = recent_runs.rename(columns={
-    'model_name': 'Model',
-    'accuracy': 'Accuracy',
-    'avg_latency': 'Avg Latency',
-    'total_cost': 'Total Cost',
-    'timestamp': 'Timestamp',
-    'id': 'Run ID'
-})
-
-st.dataframe(recent_runs, use_container_width=True, hide_index=True)
+].iloc[::-1].copy()
+
+# Keep columns numeric; Streamlit formats them client-side (and sorts numerically)
+recent_runs['accuracy'] = recent_runs['accuracy'] * 100
+
+st.dataframe(
+    recent_runs,
+    use_container_width=True,
+    hide_index=True,
+    column_config={
+        'model_name': st.column_config.TextColumn('Model'),
+        'accuracy': st.column_config.NumberColumn('Accuracy', format="%.1f%%"),
+        'avg_latency': st.column_config.NumberColumn('Avg Latency', format="%.2fs"),
+        'total_cost': st.column_config.NumberColumn('Total Cost', format="$%.4f"),
+        'timestamp': st.column_config.DatetimeColumn('Timestamp', format="YYYY-MM-DD HH:mm:ss"),
+        'id': st.column_config.NumberColumn('Run ID')
+    }
+)
 
 st.divider()
 st.caption("💡 Tip: Click on a model in the legend to hide/show it on the chart")
@@ -4,16 +4,12 @@ Explore individual evaluation runs with detailed results for each question.
 """
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import sys
-import os
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.api_client import get_api_client
+from utils.api_client import APIError
+from utils.cache import get_runs_df, load_run_detail, render_refresh_button, coerce_dtypes
 from utils.theme_manager import apply_theme, render_theme_toggle, get_plotly_template, apply_plot_theme
-from utils.pdf_generator import generate_run_detail_pdf
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # Page config
 st.set_page_config(page_title="Run Detail - Eval Dashboard", page_icon="🔍", layout="wide")
@@ -25,34 +21,21 @@ st.title("🔍 Run Detail Explorer")
 st.markdown("Drill down into individual evaluation runs and analyze question-level performance")
 st.divider()
 
-# Get API client
-api = get_api_client()
+render_refresh_button()
 
-# Fetch all runs for selection (API max page_size is 100)
+# Fetch all runs (shared with the other pages for this session)
 with st.spinner("Loading evaluation runs..."):
-    all_runs = []
-    page = 1
-    while True:
-        runs_data = api.get_runs(page=page, page_size=100)
-        if not runs_data or not runs_data.get("runs"):
-            break
-        all_runs.extend(runs_data["runs"])
-        if len(runs_data["runs"]) < 100:  # Last page
-            break
-        page += 1
-
-    runs_data = {"runs": all_runs, "total": len(all_runs)}
-
-if not runs_data or not runs_data.get("runs"):
+    runs_df = get_runs_df()
+
+if runs_df.empty:
     st.warning("No evaluation runs found. Run an evaluation first!")
     st.info("Start an evaluation: `python core/evaluate.py`")
     st.stop()
 
 # Create run selector options
-runs = runs_data["runs"]
 run_options = {
-    f"Run #{run['id']} - {run['model_name']} - {run['timestamp'][:19]} ({run['accuracy']:.1%})": run['id']
-    for run in runs
+    f"Run #{run_id} - {model_name} - {timestamp[:19]} ({accuracy:.1%})": run_id
+    for run_id, model_name, timestamp, accuracy in runs_df[['id', 'model_name', 'timestamp', 'accuracy']].itertuples(index=False, name=None)
 }
 
 # Sidebar - Run selector
@@ -65,9 +48,13 @@ selected_run_label = st.sidebar.selectbox(
 
 selected_run_id = run_options[selected_run_label]
 
-# Fetch detailed run data
-with st.spinner("Loading run details..."):
-    run_detail = api.get_run_detail(selected_run_id)
+# Fetch detailed run data (failures raise, so they are never cached)
+try:
+    with st.spinner("Loading run details..."):
+        run_detail = load_run_detail(selected_run_id)
+except APIError as e:
+    st.error(f"API Error: {e}")
+    st.stop()
 
 if not run_detail:
     st.error("Failed to load run details")
@@ -113,44 +100,56 @@ st.divider()
 # Category Breakdown
 st.header("📊 Performance by Category")
 
+@st.cache_data(ttl=300, show_spinner=False)
+def build_category_figure(category_df):
+    """Build the per-category accuracy bar chart (Plotly imported on first use)."""
+    import plotly.express as px
+    fig = px.bar(
+        category_df,
+        x='Category',
+        y='Average Score',
+        title='Accuracy by Question Category',
+        color='Average Score',
+        color_continuous_scale='RdYlGn',
+        range_color=[0, 1]
+    )
+    fig.update_layout(
+        yaxis_tickformat=".0%",
+        showlegend=False,
+        height=400
+    )
+    return fig
+
+
 if category_breakdown:
     # Convert to DataFrame for visualization
-    category_df = pd.DataFrame([
-        {
-            'Category': cat,
-            'Questions': data['total_questions'],
-            'Average Score': data['avg_score']
-        }
-        for cat, data in category_breakdown.items()
-    ]).sort_values('Average Score', ascending=False)
+    category_df = (
+        pd.DataFrame.from_dict(category_breakdown, orient='index')
+        [['total_questions', 'avg_score']]
+        .rename(columns={'total_questions': 'Questions', 'avg_score': 'Average Score'})
+        .rename_axis('Category')
+        .reset_index()
+        .sort_values('Average Score', ascending=False)
+    )
 
     # Create two columns for chart and table
     chart_col, table_col = st.columns([2, 1])
 
     with chart_col:
-        # Bar chart
-        fig = px.bar(
-            category_df,
-            x='Category',
-            y='Average Score',
-            title='Accuracy by Question Category',
-            color='Average Score',
-            color_continuous_scale='RdYlGn',
-            range_color=[0, 1]
-        )
-        fig.update_layout(
-            yaxis_tickformat=".0%",
-            showlegend=False,
-            height=400
-        )
+        fig = build_category_figure(category_df)
         apply_plot_theme(fig)
         st.plotly_chart(fig, use_container_width=True, theme=None)
 
     with table_col:
         # Category stats table
         display_df = category_df.copy()
-        display_df['Average Score'] = display_df['Average Score'].apply(lambda x: f"{x:.1%}")
-        st.dataframe(display_df, use_container_width=True, hide_index=True)
+        display_df['Average Score'] = display_df['Average Score'] * 100
+        st.dataframe(
+            display_df,
+            use_container_width=True,
+            hide_index=True,
+            column_config={'Average Score': st.column_config.NumberColumn(format="%.1f%%")}
+        )
 
 st.divider()
 
@@ -158,13 +157,13 @@ st.divider()
 st.header("📝 Question-Level Results")
 
 # Convert evaluations to DataFrame
-eval_df = pd.DataFrame(evaluations)
+eval_df = coerce_dtypes(pd.DataFrame(evaluations))
 
 # Sidebar filters for questions
 st.sidebar.header("Filter Questions")
 
-# Category filter
-categories = sorted(eval_df['category'].unique())
+# Category filter (the API breakdown already lists each category once)
+categories = sorted(category_breakdown)
 selected_categories = st.sidebar.multiselect(
     "Categories",
     options=categories,
@@ -207,78 +206,117 @@ elif sort_by == 'Cost':
 # Display count
 st.caption(f"Showing {len(filtered_eval_df)} of {len(eval_df)} questions")
 
-# Question cards
-for idx, row in filtered_eval_df.iterrows():
-    # Determine color based on score
-    if row['judge_score'] >= 0.8:
-        score_color = "🟢"
-    elif row['judge_score'] >= 0.5:
-        score_color = "🟡"
-    else:
-        score_color = "🔴"
-
-    with st.expander(
-        f"{score_color} Q{row['question_id']} - {row['category']} - Score: {row['judge_score']:.0%}",
-        expanded=False
-    ):
-        # Question details
-        detail_col1, detail_col2, detail_col3 = st.columns([2, 1, 1])
-
-        with detail_col1:
-            st.markdown("**Question:**")
-            st.info(row['question_text'])
-
-        with detail_col2:
-            st.metric("Judge Score", f"{row['judge_score']:.0%}")
-            st.metric("Latency", f"{row['latency']:.2f}s")
-
-        with detail_col3:
-            st.metric("Category", row['category'])
-            st.metric("Cost", f"${row['cost']:.5f}")
-
-        # Model response
-        st.markdown("**Model Response:**")
-        st.success(row['model_response'])
-
-        # Judge reasoning
-        if row.get('judge_reasoning'):
-            st.markdown("**Judge Reasoning:**")
-            st.warning(row['judge_reasoning'])
-
-        # Expected output (if available)
-        if row.get('expected_output'):
-            st.markdown("**Expected Output:**")
-            st.text(row['expected_output'])
+# Question overview: one table instead of an expander per question
+overview_df = filtered_eval_df[['question_id', 'category', 'judge_score', 'latency', 'cost']].copy()
+overview_df.insert(0, 'status', pd.cut(
+    overview_df['judge_score'],
+    bins=[float('-inf'), 0.5, 0.8, float('inf')],
+    labels=['🔴', '🟡', '🟢'],
+    right=False
+))
+overview_df['judge_score'] = overview_df['judge_score'] * 100
+
+question_table = st.dataframe(
+    overview_df,
+    use_container_width=True,
+    hide_index=True,
+    column_config={
+        'status': st.column_config.TextColumn('', width='small'),
+        'question_id': st.column_config.TextColumn('Question'),
+        'category': st.column_config.TextColumn('Category'),
+        'judge_score': st.column_config.NumberColumn('Score', format="%.0f%%"),
+        'latency': st.column_config.NumberColumn('Latency', format="%.2fs"),
+        'cost': st.column_config.NumberColumn('Cost', format="$%.5f")
+    },
+    on_select="rerun",
+    selection_mode="single-row",
+    # Selections are row positions: a new key per run/filter/sort state drops a
+    # selection that would now point at a different (or missing) row
+    key=f"question_table_{selected_run_id}_{hash((tuple(selected_categories), min_score, sort_by))}"
+)
+
+# Detail panel for the selected question only
+selected_rows = question_table.selection.rows
+if selected_rows and selected_rows[0] < len(filtered_eval_df):
+    # Namedtuple access avoids boxing the row into an object-dtype Series
+    row = next(filtered_eval_df.iloc[selected_rows[:1]].itertuples(index=False))
+
+    st.subheader(f"Q{row.question_id} - {row.category}")
+
+    # Question details
+    detail_col1, detail_col2, detail_col3 = st.columns([2, 1, 1])
+
+    with detail_col1:
+        st.markdown("**Question:**")
+        st.info(row.question_text)
+
+    with detail_col2:
+        st.metric("Judge Score", f"{row.judge_score:.0%}")
+        st.metric("Latency", f"{row.latency:.2f}s")
+
+    with detail_col3:
+        st.metric("Category", row.category)
+        st.metric("Cost", f"${row.cost:.5f}")
+
+    # Model response
+    st.markdown("**Model Response:**")
+    st.success(row.model_response)
+
+    # Judge reasoning
+    if row.judge_reasoning:
+        st.markdown("**Judge Reasoning:**")
+        st.warning(row.judge_reasoning)
+
+    # Expected output (if available)
+    if row.expected_output:
+        st.markdown("**Expected Output:**")
+        st.text(row.expected_output)
+else:
+    st.caption("Select a question in the table to see the model response and judge reasoning")
 
 st.divider()
 
 # Export option
 st.header("💾 Export Results")
 
+
+# Exports are cached on the run and filter state (underscore args are not hashed),
+# so the bytes are serialized once per filter change rather than on every rerun
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def export_csv_bytes(run_id, categories, min_score, sort_by, _df):
+    """Serialize the filtered question results as CSV bytes."""
+    return _df.to_csv(index=False, lineterminator='\n').encode('utf-8')
+
+
+@st.cache_data(ttl=300, max_entries=32, show_spinner=False)
+def export_summary_json(run_id, _run_detail):
+    """Serialize the run summary and category breakdown as JSON."""
+    import json
+    return json.dumps({
+        "run_summary": _run_detail["run"],
+        "category_breakdown": _run_detail["category_breakdown"],
+        "total_questions": len(_run_detail["evaluations"])
+    }, indent=2)
+
+
 export_col1, export_col2 = st.columns(2)
 
 with export_col1:
     # Export to CSV
-    csv_data = filtered_eval_df.to_csv(index=False)
     st.download_button(
         label="📥 Download as CSV",
-        data=csv_data,
+        data=export_csv_bytes(
+            selected_run_id, tuple(sorted(selected_categories)), min_score, sort_by, filtered_eval_df
+        ),
         file_name=f"run_{selected_run_id}_results.csv",
         mime="text/csv"
     )
 
 with export_col2:
     # Export summary as JSON
-    import json
-    summary_json = json.dumps({
-        "run_summary": run_summary,
-        "category_breakdown": category_breakdown,
-        "total_questions": len(evaluations)
-    }, indent=2)
-
     st.download_button(
         label="📥 Download Summary as JSON",
-        data=summary_json,
+        data=export_summary_json(selected_run_id, run_detail),
         file_name=f"run_{selected_run_id}_summary.json",
         mime="application/json"
     )
@@ -289,6 +327,23 @@ st.caption("💡 Tip: Use filters in the sidebar to focus on specific categories
 st.divider()
 st.subheader("📄 Export Run Detail Report")
 
+# Session-state key for the in-flight or finished PDF job of this session
+PDF_JOB_STATE_KEY = "_pdf_job"
+
+
+@st.cache_resource
+def get_pdf_executor():
+    """Shared worker pool so PDF generation doesn't block the script thread."""
+    return ThreadPoolExecutor(max_workers=2)
+
+
+@st.fragment(run_every=1)
+def render_pdf_progress():
+    """Poll the PDF job once a second; rerun the page when it finishes."""
+    if st.session_state[PDF_JOB_STATE_KEY]["future"].done():
+        st.rerun()
+    st.info("⏳ Generating PDF report...")
+
 col1, col2 = st.columns([2, 1])
 with col1:
     st.markdown(f"Generate a detailed PDF report for Run #{selected_run_id}")
@@ -297,27 +352,41 @@ with col2:
     # Button to trigger PDF generation
     if st.button("📄 Generate PDF", type="primary", use_container_width=True, key="gen_pdf_run"):
         try:
-            with st.spinner("Generating PDF report..."):
-                pdf_bytes = generate_run_detail_pdf(
+            # Imported on click: pulls in ReportLab, Plotly and Kaleido
+            from utils.pdf_generator import generate_run_detail_pdf
+            st.session_state[PDF_JOB_STATE_KEY] = {
+                "run_id": selected_run_id,
+                "future": get_pdf_executor().submit(
+                    generate_run_detail_pdf,
                     run_detail['run'],
                     filtered_eval_df,
                     run_detail.get('category_breakdown', {})
                 )
+            }
+        except Exception as e:
+            st.session_state.pop(PDF_JOB_STATE_KEY, None)
+            st.error(f"❌ Failed to generate PDF: {str(e)}")
 
+    pdf_job = st.session_state.get(PDF_JOB_STATE_KEY)
+    if pdf_job and pdf_job["run_id"] == selected_run_id:
+        if not pdf_job["future"].done():
+            render_pdf_progress()
+        elif pdf_job["future"].exception():
+            error = pdf_job["future"].exception()
+            st.error(f"❌ Failed to generate PDF: {str(error)}")
+            import traceback
+            st.code("".join(traceback.format_exception(error)))
+        else:
             st.success("✅ PDF generated successfully!")
 
             # Offer download button
             st.download_button(
                 label="⬇️ Download Run Detail PDF",
-                data=pdf_bytes,
+                data=pdf_job["future"].result(),
                 file_name=f"run_{selected_run_id}_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
                 mime="application/pdf",
                 use_container_width=True
             )
-        except Exception as e:
-            st.error(f"❌ Failed to generate PDF: {str(e)}")
-            import traceback
-            st.code(traceback.format_exc())
 
 # Render theme toggle
 render_theme_toggle()
@@ -4,19 +4,35 @@ Side-by-side comparison of model metrics with visual heatmap.
 """
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
-import plotly.express as px
-import sys
-import os
 import urllib.parse
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.api_client import get_api_client
-from utils.theme_manager import apply_theme, render_theme_toggle, get_plotly_template, apply_plot_theme
-from utils.pdf_generator import generate_model_comparison_pdf
+from utils.api_client import APIError
+from utils.cache import load_models_df, render_refresh_button
+from utils.theme_manager import apply_theme, render_theme_toggle, apply_plot_theme, get_vega_config
 from datetime import datetime
 
+# Rank labels for the top three leaderboard rows
+MEDAL_RANKS = ["🥇 1", "🥈 2", "🥉 3"]
+
+# Leaderboard columns and their display labels
+LEADERBOARD_COLUMNS = {
+    'model_name': 'Model',
+    'avg_accuracy': 'Avg Accuracy',
+    'best_accuracy': 'Best Accuracy',
+    'worst_accuracy': 'Worst Accuracy',
+    'avg_cost': 'Avg Cost',
+    'avg_latency': 'Avg Latency',
+    'total_runs': 'Total Runs'
+}
+
+# Recommendation weights for normalized accuracy, cost and latency
+COMPOSITE_WEIGHTS = np.array([0.5, 0.3, 0.2])
+
+# Diameter (px) of the largest cost-accuracy bubble, matching Plotly Express' default size_max
+SCATTER_MAX_BUBBLE_PX = 20
+
 # Page config
 st.set_page_config(page_title="Model Comparison - Eval Dashboard", page_icon="⚖️", layout="wide")
 
@@ -27,9 +43,6 @@ st.title("⚖️ Model Comparison Matrix")
 st.markdown("Compare model performance across accuracy, cost, and latency metrics")
 st.divider()
 
-# Get API client
-api = get_api_client()
-
 # Sidebar - Time Filter (needs to be defined BEFORE API call)
 st.sidebar.header("🕐 Time Period")
 
@@ -49,24 +62,7 @@ time_filter = st.sidebar.selectbox(
 
 selected_days = time_filter_options[time_filter]
 
-# Fetch model statistics with time filter
-with st.spinner("Loading model statistics..."):
-    models_data = api.get_models(days=selected_days)
-
-if not models_data or not models_data.get("models"):
-    st.warning("No model data found. Run an evaluation first!")
-    st.info("Start an evaluation: `python core/evaluate.py`")
-    st.stop()
-
-# Convert to DataFrame
-models_df = pd.DataFrame(models_data["models"])
-
-# Filter out models with no runs
-models_df = models_df[models_df['total_runs'] > 0]
-
-if models_df.empty:
-    st.warning("No completed evaluation runs found.")
-    st.stop()
+render_refresh_button()
 
 # Sidebar - Display Options
 st.sidebar.divider()
@@ -81,7 +77,6 @@ sort_by = st.sidebar.selectbox(
 
 sort_ascending = st.sidebar.checkbox("Ascending Order", value=False)
 
-# Apply sorting
 sort_column_map = {
     'Average Accuracy': 'avg_accuracy',
     'Best Accuracy': 'best_accuracy',
@@ -90,10 +85,23 @@ sort_column_map = {
     'Total Runs': 'total_runs'
 }
 
-models_df = models_df.sort_values(
-    by=sort_column_map[sort_by],
-    ascending=sort_ascending
-)
+# Fetch, filter out models with no runs, and sort (cached per period and sort order;
+# failures raise, so they are never cached)
+try:
+    with st.spinner("Loading model statistics..."):
+        models_df = load_models_df(selected_days, sort_column_map[sort_by], sort_ascending)
+except APIError as e:
+    st.error(f"API Error: {e}")
+    st.stop()
+
+if models_df is None:
+    st.warning("No model data found. Run an evaluation first!")
+    st.info("Start an evaluation: `python core/evaluate.py`")
+    st.stop()
+
+if models_df.empty:
+    st.warning("No completed evaluation runs found.")
+    st.stop()
 
 # Model selection
 st.sidebar.header("Filter Models")
@@ -110,7 +118,16 @@ if not selected_models:
     st.stop()
 
 # Filter DataFrame
-filtered_df = models_df[models_df['model_name'].isin(selected_models)].copy()
+filtered_df = models_df[models_df['model_name'].isin(selected_models)]
+
+# Column extremes reused by the heatmap, baseline, winners and recommendation
+# (one float64 array; winners are row positions for filtered_df.iloc)
+metric_values = filtered_df[['avg_accuracy', 'avg_cost', 'avg_latency']]
+metric_array = metric_values.to_numpy(dtype=np.float64)
+metric_max = pd.Series(metric_array.max(axis=0), index=metric_values.columns)
+most_accurate_pos = metric_array[:, 0].argmax()
+cheapest_pos, fastest_pos = metric_array[:, 1:].argmin(axis=0)
+most_expensive_pos = metric_array[:, 1].argmax()
 
 # Leaderboard Section
 st.header("🏆 Model Leaderboard")
@@ -123,48 +140,13 @@ elif time_filter == "Last 30 Days":
 else:
     st.caption("📅 **All-Time Leaderboard** - Complete historical rankings")
 
-# Create display DataFrame
-display_df = filtered_df[[
-    'model_name',
-    'avg_accuracy',
-    'best_accuracy',
-    'worst_accuracy',
-    'avg_cost',
-    'avg_latency',
-    'total_runs'
-]].copy()
-
-# Format columns
-display_df['avg_accuracy'] = display_df['avg_accuracy'].apply(lambda x: f"{x:.1%}")
-display_df['best_accuracy'] = display_df['best_accuracy'].apply(lambda x: f"{x:.1%}")
-display_df['worst_accuracy'] = display_df['worst_accuracy'].apply(lambda x: f"{x:.1%}")
-display_df['avg_cost'] = display_df['avg_cost'].apply(lambda x: f"${x:.4f}")
-display_df['avg_latency'] = display_df['avg_latency'].apply(lambda x: f"{x:.2f}s")
-
-# Rename columns
-display_df = display_df.rename(columns={
-    'model_name': 'Model',
-    'avg_accuracy': 'Avg Accuracy',
-    'best_accuracy': 'Best Accuracy',
-    'worst_accuracy': 'Worst Accuracy',
-    'avg_cost': 'Avg Cost',
-    'avg_latency': 'Avg Latency',
-    'total_runs': 'Total Runs'
-})
+# Leaderboard rows: a column subset indexed by rank, formatted by a Styler at render time
+leaderboard_df = filtered_df[list(LEADERBOARD_COLUMNS)]
 
 # Add ranking with medals for top 3
-ranks = []
-for i in range(1, len(display_df) + 1):
-    if i == 1:
-        ranks.append("🥇 1")
-    elif i == 2:
-        ranks.append("🥈 2")
-    elif i == 3:
-        ranks.append("🥉 3")
-    else:
-        ranks.append(str(i))
-
-display_df.insert(0, 'Rank', ranks)
+ranks = np.arange(1, len(leaderboard_df) + 1).astype(str).astype(object)
+ranks[:3] = MEDAL_RANKS[:len(ranks)]
+leaderboard_df.index = pd.Index(ranks, name='Rank')
 
 # Highlight the champion
 if not filtered_df.empty:
@@ -193,11 +175,17 @@ if not filtered_df.empty:
 
 st.divider()
 
-# Display table with custom styling
+# Display table with custom styling (Styler formats values; raw numbers still sort numerically)
 st.dataframe(
-    display_df,
+    leaderboard_df.style.format({
+        'avg_accuracy': '{:.1%}',
+        'best_accuracy': '{:.1%}',
+        'worst_accuracy': '{:.1%}',
+        'avg_cost': '${:.4f}',
+        'avg_latency': '{:.2f}s'
+    }),
     use_container_width=True,
-    hide_index=True
+    column_config={'_index': 'Rank', **LEADERBOARD_COLUMNS}
 )
 
 st.divider()
@@ -206,22 +194,13 @@ st.divider()
 st.header("🔥 Performance Heatmap")
 
 # Create heatmap data
-heatmap_df = filtered_df[[
-    'model_name',
-    'avg_accuracy',
-    'avg_cost',
-    'avg_latency'
-]].copy()
-
 # Normalize metrics (0-1 scale for better visualization)
 # Higher is better for accuracy, lower is better for cost and latency
-heatmap_df['accuracy_norm'] = heatmap_df['avg_accuracy']
-heatmap_df['cost_norm'] = 1 - (heatmap_df['avg_cost'] / heatmap_df['avg_cost'].max())
-heatmap_df['latency_norm'] = 1 - (heatmap_df['avg_latency'] / heatmap_df['avg_latency'].max())
+heatmap_data = metric_array.copy()
+heatmap_data[:, 1:] = 1 - heatmap_data[:, 1:] / metric_max[['avg_cost', 'avg_latency']].to_numpy()
 
 # Create heatmap
-heatmap_data = heatmap_df[['accuracy_norm', 'cost_norm', 'latency_norm']].values
-model_names = heatmap_df['model_name'].tolist()
+model_names = filtered_df['model_name'].tolist()
 metrics = ['Accuracy', 'Cost\n(lower is better)', 'Latency\n(lower is better)']
 
 fig_heatmap = go.Figure(data=go.Heatmap(
@@ -229,7 +208,7 @@ fig_heatmap = go.Figure(data=go.Heatmap(
     x=metrics,
     y=model_names,
     colorscale='RdYlGn',
-    text=[[f"{val:.2f}" for val in row] for row in heatmap_data],
+    text=np.char.mod('%.2f', heatmap_data),
     texttemplate='%{text}',
     textfont={"size": 10},
     colorbar=dict(title="Normalized\nScore")
@@ -251,113 +230,143 @@ st.divider()
 # Scatter Plot - Cost vs Accuracy
 st.header("💰 Cost-Accuracy Trade-off")
 
-fig_scatter = px.scatter(
-    filtered_df,
-    x='avg_cost',
-    y='avg_accuracy',
-    size='avg_latency',
-    color='model_name',
-    hover_name='model_name',
-    hover_data={
-        'avg_cost': ':.4f',
-        'avg_accuracy': ':.1%',
-        'avg_latency': ':.2f',
-        'total_runs': True
-    },
-    title="Model Positioning: Accuracy vs Cost (bubble size = latency)",
-    labels={
-        'avg_cost': 'Average Cost per Evaluation ($)',
-        'avg_accuracy': 'Average Accuracy',
-        'avg_latency': 'Avg Latency (s)'
-    }
-)
+# One WebGL trace for all models (colored by accuracy, labeled by name) instead of a trace per model
+fig_scatter = go.Figure(go.Scattergl(
+    x=filtered_df['avg_cost'],
+    y=filtered_df['avg_accuracy'],
+    mode='markers+text',
+    text=filtered_df['model_name'],
+    textposition='top center',
+    textfont={"size": 10},
+    customdata=filtered_df[['avg_latency', 'total_runs']].to_numpy(),
+    marker=dict(
+        size=filtered_df['avg_latency'],
+        sizemode='area',
+        sizeref=2 * metric_max['avg_latency'] / SCATTER_MAX_BUBBLE_PX ** 2,
+        color=filtered_df['avg_accuracy'],
+        colorscale='Viridis',
+        showscale=False
+    ),
+    hovertemplate=(
+        "<b>%{text}</b><br>" +
+        "Cost: $%{x:.4f}<br>" +
+        "Accuracy: %{y:.1%}<br>" +
+        "Latency: %{customdata[0]:.2f}s<br>" +
+        "Runs: %{customdata[1]}" +
+        "<extra></extra>"
+    )
+))
 
 fig_scatter.update_layout(
+    title="Model Positioning: Accuracy vs Cost (bubble size = latency)",
+    xaxis_title="Average Cost per Evaluation ($)",
+    yaxis_title="Average Accuracy",
     yaxis_tickformat=".0%",
-    height=500,
-    showlegend=True
+    height=500
 )
+
+# Quadrant guides at the median cost and accuracy of the selected models
+fig_scatter.add_vline(x=filtered_df['avg_cost'].median(), line_dash="dot", line_color="gray")
+fig_scatter.add_hline(y=filtered_df['avg_accuracy'].median(), line_dash="dot", line_color="gray")
 apply_plot_theme(fig_scatter)
 st.plotly_chart(fig_scatter, use_container_width=True, theme=None)
 
-st.caption("💡 **Sweet Spot**: Top-right quadrant = High accuracy + Low cost")
+st.caption("💡 **Sweet Spot**: Top-left quadrant = High accuracy + Low cost")
 
 st.divider()
 
 # Detailed Metrics Comparison
 st.header("📊 Detailed Metrics")
 
-metrics_tab1, metrics_tab2, metrics_tab3 = st.tabs(["Accuracy", "Cost", "Latency"])
-
-with metrics_tab1:
-    # Accuracy comparison
-    fig_acc = go.Figure()
-
-    fig_acc.add_trace(go.Bar(
-        name='Average',
-        x=filtered_df['model_name'],
-        y=filtered_df['avg_accuracy'],
-        marker_color='lightblue'
-    ))
-
-    fig_acc.add_trace(go.Bar(
-        name='Best',
-        x=filtered_df['model_name'],
-        y=filtered_df['best_accuracy'],
-        marker_color='green'
-    ))
-
-    fig_acc.add_trace(go.Bar(
-        name='Worst',
-        x=filtered_df['model_name'],
-        y=filtered_df['worst_accuracy'],
-        marker_color='orange'
-    ))
-
-    fig_acc.update_layout(
-        title="Accuracy Comparison (Avg, Best, Worst)",
-        xaxis_title="Model",
-        yaxis_title="Accuracy",
-        yaxis_tickformat=".0%",
-        barmode='group',
-        height=400
-    )
-    
-    apply_plot_theme(fig_acc)
-
-    st.plotly_chart(fig_acc, use_container_width=True, theme=None)
-
-with metrics_tab2:
-    # Cost comparison
-    fig_cost = px.bar(
-        filtered_df,
-        x='model_name',
-        y='avg_cost',
-        title="Average Cost per Evaluation",
-        labels={'avg_cost': 'Cost ($)', 'model_name': 'Model'},
-        color='avg_cost',
-        color_continuous_scale='RdYlGn_r'
+@st.fragment
+def render_detailed_metrics(filtered_df):
+    """Metric picker and its bar chart; a fragment, so switching metrics reruns only this block."""
+    # A radio instead of st.tabs: tabs run every branch, so all three figures were built each rerun
+    metric_view = st.radio(
+        "Metric",
+        options=["Accuracy", "Cost", "Latency"],
+        horizontal=True,
+        label_visibility="collapsed",
+        key="detailed_metric_view"
     )
 
-    fig_cost.update_layout(height=400)
-    apply_plot_theme(fig_cost)
-    st.plotly_chart(fig_cost, use_container_width=True, theme=None)
-
-with metrics_tab3:
-    # Latency comparison
-    fig_latency = px.bar(
-        filtered_df,
-        x='model_name',
-        y='avg_latency',
-        title="Average Latency per Question",
-        labels={'avg_latency': 'Latency (seconds)', 'model_name': 'Model'},
-        color='avg_latency',
-        color_continuous_scale='RdYlGn_r'
-    )
+    # Vega-Lite specs are plain dicts, so no Plotly figure is built or serialized
+    if metric_view == "Accuracy":
+        # Accuracy comparison (grouped bars: average, best, worst)
+        accuracy_df = filtered_df[['model_name', 'avg_accuracy', 'best_accuracy', 'worst_accuracy']].rename(
+            columns={'avg_accuracy': 'Average', 'best_accuracy': 'Best', 'worst_accuracy': 'Worst'}
+        )
+        st.vega_lite_chart(accuracy_df, {
+            "title": "Accuracy Comparison (Avg, Best, Worst)",
+            "height": 400,
+            "transform": [{"fold": ["Average", "Best", "Worst"], "as": ["Statistic", "accuracy"]}],
+            "mark": "bar",
+            "encoding": {
+                "x": {"field": "model_name", "type": "nominal", "title": "Model", "sort": None},
+                "xOffset": {"field": "Statistic", "sort": ["Average", "Best", "Worst"]},
+                "y": {"field": "accuracy", "type": "quantitative", "title": "Accuracy", "axis": {"format": ".0%"}},
+                "color": {
+                    "field": "Statistic",
+                    "type": "nominal",
+                    "scale": {"domain": ["Average", "Best", "Worst"], "range": ["lightblue", "green", "orange"]}
+                },
+                "tooltip": [
+                    {"field": "model_name", "title": "Model"},
+                    {"field": "Statistic"},
+                    {"field": "accuracy", "title": "Accuracy", "format": ".1%"}
+                ]
+            },
+            "config": get_vega_config()
+        }, use_container_width=True, theme=None)
+
+    elif metric_view == "Cost":
+        # Cost comparison
+        st.vega_lite_chart(filtered_df[['model_name', 'avg_cost']], {
+            "title": "Average Cost per Evaluation",
+            "height": 400,
+            "mark": "bar",
+            "encoding": {
+                "x": {"field": "model_name", "type": "nominal", "title": "Model", "sort": None},
+                "y": {"field": "avg_cost", "type": "quantitative", "title": "Cost ($)"},
+                "color": {
+                    "field": "avg_cost",
+                    "type": "quantitative",
+                    "title": "Cost ($)",
+                    "scale": {"scheme": "redyellowgreen", "reverse": True}
+                },
+                "tooltip": [
+                    {"field": "model_name", "title": "Model"},
+                    {"field": "avg_cost", "title": "Cost ($)", "format": "$.4f"}
+                ]
+            },
+            "config": get_vega_config()
+        }, use_container_width=True, theme=None)
 
-    fig_latency.update_layout(height=400)
-    apply_plot_theme(fig_latency)
-    st.plotly_chart(fig_latency, use_container_width=True, theme=None)
+    else:
+        # Latency comparison
+        st.vega_lite_chart(filtered_df[['model_name', 'avg_latency']], {
+            "title": "Average Latency per Question",
+            "height": 400,
+            "mark": "bar",
+            "encoding": {
+                "x": {"field": "model_name", "type": "nominal", "title": "Model", "sort": None},
+                "y": {"field": "avg_latency", "type": "quantitative", "title": "Latency (seconds)"},
+                "color": {
+                    "field": "avg_latency",
+                    "type": "quantitative",
+                    "title": "Latency (s)",
+                    "scale": {"scheme": "redyellowgreen", "reverse": True}
+                },
+                "tooltip": [
+                    {"field": "model_name", "title": "Model"},
+                    {"field": "avg_latency", "title": "Latency (s)", "format": ".2f"}
+                ]
+            },
+            "config": get_vega_config()
+        }, use_container_width=True, theme=None)
+
+
+render_detailed_metrics(filtered_df)
 
 st.divider()
 
@@ -366,114 +375,126 @@ st.header("💰 Cost Savings Calculator")
 st.markdown("**Calculate potential savings by choosing the optimal model vs GPT-4o baseline**")
 
 # Find GPT-4o baseline (or closest match)
-gpt4o_baseline = filtered_df[filtered_df['model_name'].str.contains('gpt-4o', case=False, na=False)]
+gpt4o_baseline = filtered_df[filtered_df['is_baseline']]
 if not gpt4o_baseline.empty:
     baseline_cost = gpt4o_baseline.iloc[0]['avg_cost']
     baseline_model = gpt4o_baseline.iloc[0]['model_name']
 else:
     # Fallback: use the most expensive model as baseline
-    baseline_cost = filtered_df['avg_cost'].max()
-    baseline_model = filtered_df.loc[filtered_df['avg_cost'].idxmax(), 'model_name']
+    baseline_cost = metric_max['avg_cost']
+    baseline_model = filtered_df['model_name'].iloc[most_expensive_pos]
 
 st.caption(f"Using **{baseline_model}** as baseline (${baseline_cost:.4f} per evaluation)")
 
-# Usage projections
-col1, col2 = st.columns([1, 2])
 
-with col1:
-    st.subheader("📊 Usage Projections")
-
-    # User inputs for projections
-    evals_per_day = st.slider(
-        "Evaluations per day",
-        min_value=10,
-        max_value=10000,
-        value=100,
-        step=10,
-        help="Estimated number of model evaluations per day in production"
-    )
+@st.fragment
+def render_savings_calculator(models_by_name, selected_models, baseline_model, baseline_cost):
+    """
+    Projection inputs and savings; a fragment, so its widgets rerun only this block.
 
-    selected_model_for_calc = st.selectbox(
-        "Compare model",
-        options=selected_models,
-        index=0,
-        help="Model to compare against baseline"
-    )
+    models_by_name is filtered_df indexed by model_name, so lookups are hash-based.
+    """
+    # Usage projections
+    col1, col2 = st.columns([1, 2])
 
-with col2:
-    st.subheader("💸 Projected Savings")
-
-    # Calculate savings
-    selected_model_cost = filtered_df[filtered_df['model_name'] == selected_model_for_calc].iloc[0]['avg_cost']
-    cost_diff_per_eval = baseline_cost - selected_model_cost
-
-    # Calculate projections
-    daily_savings = cost_diff_per_eval * evals_per_day
-    weekly_savings = daily_savings * 7
-    monthly_savings = daily_savings * 30
-    annual_savings = daily_savings * 365
-
-    # Display metrics
-    metric_cols = st.columns(4)
-
-    with metric_cols[0]:
-        st.metric(
-            "Daily Savings",
-            f"${abs(daily_savings):.2f}",
-            delta=f"${cost_diff_per_eval:.4f} per eval",
-            delta_color="normal" if daily_savings >= 0 else "inverse"
+    with col1:
+        st.subheader("📊 Usage Projections")
+
+        # User inputs for projections
+        evals_per_day = st.slider(
+            "Evaluations per day",
+            min_value=10,
+            max_value=10000,
+            value=100,
+            step=10,
+            help="Estimated number of model evaluations per day in production"
         )
 
-    with metric_cols[1]:
-        st.metric(
-            "Weekly Savings",
-            f"${abs(weekly_savings):.2f}",
-            delta=None
+        selected_model_for_calc = st.selectbox(
+            "Compare model",
+            options=selected_models,
+            index=0,
+            help="Model to compare against baseline"
         )
 
-    with metric_cols[2]:
-        st.metric(
-            "Monthly Savings",
-            f"${abs(monthly_savings):.2f}",
-            delta=None
-        )
+    with col2:
+        st.subheader("💸 Projected Savings")
+
+        # Calculate savings
+        selected_row = models_by_name.loc[selected_model_for_calc]
+        selected_model_cost = selected_row['avg_cost']
+        cost_diff_per_eval = baseline_cost - selected_model_cost
+
+        # Calculate projections
+        daily_savings = cost_diff_per_eval * evals_per_day
+        weekly_savings = daily_savings * 7
+        monthly_savings = daily_savings * 30
+        annual_savings = daily_savings * 365
+
+        # Display metrics
+        metric_cols = st.columns(4)
+
+        with metric_cols[0]:
+            st.metric(
+                "Daily Savings",
+                f"${abs(daily_savings):.2f}",
+                delta=f"${cost_diff_per_eval:.4f} per eval",
+                delta_color="normal" if daily_savings >= 0 else "inverse"
+            )
 
-    with metric_cols[3]:
-        st.metric(
-            "Annual Savings",
-            f"${abs(annual_savings):,.2f}",
-            delta=None
-        )
+        with metric_cols[1]:
+            st.metric(
+                "Weekly Savings",
+                f"${abs(weekly_savings):.2f}",
+                delta=None
+            )
 
-    # Summary message
-    if daily_savings > 0:
-        st.success(
-            f"✅ **Switching to {selected_model_for_calc} saves ${monthly_savings:.2f}/month** "
-            f"(${annual_savings:,.2f}/year) at {evals_per_day} evals/day"
-        )
+        with metric_cols[2]:
+            st.metric(
+                "Monthly Savings",
+                f"${abs(monthly_savings):.2f}",
+                delta=None
+            )
 
-        # ROI comparison
-        accuracy_diff = (
-            filtered_df[filtered_df['model_name'] == selected_model_for_calc].iloc[0]['avg_accuracy'] -
-            filtered_df[filtered_df['model_name'] == baseline_model].iloc[0]['avg_accuracy']
-        )
+        with metric_cols[3]:
+            st.metric(
+                "Annual Savings",
+                f"${abs(annual_savings):,.2f}",
+                delta=None
+            )
 
-        if accuracy_diff >= 0:
-            st.info(
-                f"🎯 **Bonus:** {selected_model_for_calc} is also "
-                f"{abs(accuracy_diff):.1%} {'more' if accuracy_diff > 0 else 'equally'} accurate!"
+        # Summary message
+        if daily_savings > 0:
+            st.success(
+                f"✅ **Switching to {selected_model_for_calc} saves ${monthly_savings:.2f}/month** "
+                f"(${annual_savings:,.2f}/year) at {evals_per_day} evals/day"
             )
-        else:
-            st.warning(
-                f"⚠️ **Trade-off:** {selected_model_for_calc} is "
-                f"{abs(accuracy_diff):.1%} less accurate. Evaluate if acceptable for your use case."
+
+            # ROI comparison
+            accuracy_diff = (
+                selected_row['avg_accuracy'] -
+                models_by_name.loc[baseline_model, 'avg_accuracy']
             )
-    elif daily_savings < 0:
-        st.error(
-            f"❌ {selected_model_for_calc} costs ${abs(monthly_savings):.2f}/month MORE than {baseline_model}"
-        )
-    else:
-        st.info(f"ℹ️ Both models have identical costs")
+
+            if accuracy_diff >= 0:
+                st.info(
+                    f"🎯 **Bonus:** {selected_model_for_calc} is also "
+                    f"{abs(accuracy_diff):.1%} {'more' if accuracy_diff > 0 else 'equally'} accurate!"
+                )
+            else:
+                st.warning(
+                    f"⚠️ **Trade-off:** {selected_model_for_calc} is "
+                    f"{abs(accuracy_diff):.1%} less accurate. Evaluate if acceptable for your use case."
+                )
+        elif daily_savings < 0:
+            st.error(
+                f"❌ {selected_model_for_calc} costs ${abs(monthly_savings):.2f}/month MORE than {baseline_model}"
+            )
+        else:
+            st.info(f"ℹ️ Both models have identical costs")
+
+
+render_savings_calculator(filtered_df.set_index('model_name'), selected_models, baseline_model, baseline_cost)
 
 st.divider()
 
@@ -483,7 +504,7 @@ st.header("🥇 Category Winners")
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    best_accuracy_model = filtered_df.loc[filtered_df['avg_accuracy'].idxmax()]
+    best_accuracy_model = filtered_df.iloc[most_accurate_pos]
     st.success("**🎯 Most Accurate**")
     st.metric(
         best_accuracy_model['model_name'],
@@ -491,7 +512,7 @@ with col1:
     )
 
 with col2:
-    best_cost_model = filtered_df.loc[filtered_df['avg_cost'].idxmin()]
+    best_cost_model = filtered_df.iloc[cheapest_pos]
     st.success("**💰 Most Cost-Effective**")
     st.metric(
         best_cost_model['model_name'],
@@ -499,7 +520,7 @@ with col2:
     )
 
 with col3:
-    best_latency_model = filtered_df.loc[filtered_df['avg_latency'].idxmin()]
+    best_latency_model = filtered_df.iloc[fastest_pos]
     st.success("**⚡ Fastest**")
     st.metric(
         best_latency_model['model_name'],
@@ -511,13 +532,10 @@ st.divider()
 st.header("💡 Recommendation")
 
 # Calculate a composite score (weighted: 50% accuracy, 30% cost, 20% latency)
-filtered_df['composite_score'] = (
-    0.5 * filtered_df['avg_accuracy'] +
-    0.3 * (1 - filtered_df['avg_cost'] / filtered_df['avg_cost'].max()) +
-    0.2 * (1 - filtered_df['avg_latency'] / filtered_df['avg_latency'].max())
-)
+# from the heatmap's normalized [accuracy, cost, latency] matrix
+composite_score = heatmap_data @ COMPOSITE_WEIGHTS
 
-recommended_model = filtered_df.loc[filtered_df['composite_score'].idxmax()]
+recommended_model = filtered_df.iloc[composite_score.argmax()]
 
 st.info(
     f"**Recommended Model (Best Overall Balance):** `{recommended_model['model_name']}`\n\n"
@@ -533,6 +551,16 @@ st.caption("💡 Tip: Use the sidebar to adjust sorting and filtering options")
 st.divider()
 st.subheader("📄 Export Executive Report")
 
+
+
+@st.cache_data(ttl=300, max_entries=8, show_spinner=False)
+def build_comparison_pdf(report_df: pd.DataFrame) -> bytes:
+    """Render the comparison PDF; cached on the report rows so repeat clicks reuse the bytes."""
+    # Imported on first use: pulls in ReportLab, Plotly and Kaleido
+    from utils.pdf_generator import generate_model_comparison_pdf
+    return generate_model_comparison_pdf(report_df).getvalue()
+
+
 col1, col2 = st.columns([2, 1])
 with col1:
     st.markdown("Generate a professional PDF report with charts, tables, and recommendations.")
@@ -542,7 +570,7 @@ with col2:
     if st.button("📄 Generate PDF", type="primary", use_container_width=True):
         try:
             with st.spinner("Generating PDF report..."):
-                pdf_bytes = generate_model_comparison_pdf(filtered_df)
+                pdf_bytes = build_comparison_pdf(filtered_df)
 
             st.success("✅ PDF generated successfully!")
 
@@ -5,11 +5,8 @@ Visualize LLM execution traces with Arize Phoenix observability.
 import streamlit as st
 import requests
 from datetime import datetime
-import sys
-import os
 
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.api_client import get_http_session
 from utils.theme_manager import apply_theme, render_theme_toggle
 
 st.set_page_config(
@@ -25,12 +22,14 @@ st.title("🔍 Phoenix Observability")
 st.markdown("**Visualize LLM execution traces with waterfall timelines**")
 st.divider()
 
-# Check Phoenix status
+# Check Phoenix status (cached so theme toggles and other reruns don't re-probe)
+@st.cache_data(ttl=10, show_spinner=False)
 def check_phoenix_status():
     try:
-        response = requests.get("http://localhost:6006", timeout=2)
+        # Local server: it either answers at once or is down
+        response = get_http_session().get("http://localhost:6006", timeout=0.5)
         return response.status_code == 200
-    except:
+    except requests.RequestException:
         return False
 
 phoenix_online = check_phoenix_status()
@@ -4,15 +4,10 @@ Shows RAG-specific performance: retrieval precision/recall, grounding scores, an
 """
 import streamlit as st
 import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from datetime import datetime
-import sys
-import os
-
-# Add parent directory to path for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.api_client import get_api_client
+import numpy as np
+
+from utils.api_client import APIError
+from utils.cache import load_all_rag_runs, load_rag_drift_batch, render_refresh_button
 from utils.theme_manager import apply_theme, render_theme_toggle, get_plotly_template, apply_plot_theme
 
 # Page config
@@ -25,9 +20,6 @@ st.title("🔍 RAG Analysis - Retrieval Quality Tracker")
 st.markdown("Monitor retrieval precision/recall, answer grounding, and RAG-specific drift")
 st.divider()
 
-# Get API client
-api = get_api_client()
-
 # Sidebar filters
 st.sidebar.header("Filters")
 recall_threshold_slider = st.sidebar.slider(
@@ -38,30 +30,16 @@ recall_threshold_slider = st.sidebar.slider(
     help="Show only runs with recall above this threshold"
 )
 
-drift_threshold = st.sidebar.slider(
-    "Drift Alert Threshold (%)",
-    min_value=1,
-    max_value=10,
-    value=5,
-    help="Alert when recall drops by this percentage"
-)
+render_refresh_button()
+
+# Fetch all RAG runs (cached, fully prepared; failures are not cached)
+try:
+    rag_runs_df = load_all_rag_runs()
+except APIError as e:
+    st.error(f"API Error: {e}")
+    st.stop()
 
-# Fetch all RAG runs
-with st.spinner("Loading RAG evaluation data..."):
-    all_rag_runs = []
-    page = 1
-    while True:
-        rag_runs_data = api.get_rag_runs(page=page, page_size=100)
-        if not rag_runs_data or not rag_runs_data.get("runs"):
-            break
-        all_rag_runs.extend(rag_runs_data["runs"])
-        if len(rag_runs_data["runs"]) < 100:  # Last page
-            break
-        page += 1
-
-    rag_runs_data = {"runs": all_rag_runs, "total": len(all_rag_runs)}
-
-if not rag_runs_data or not rag_runs_data.get("runs"):
+if rag_runs_df.empty:
     st.warning("No RAG evaluation runs found. Run a RAG evaluation first!")
     st.info("Start a RAG evaluation: `python core/rag_evaluate.py`")
     st.code("""
@@ -71,13 +49,8 @@ python rag_evaluate.py
     """, language="bash")
     st.stop()
 
-# Convert to DataFrame
-rag_runs_df = pd.DataFrame(rag_runs_data["runs"])
-rag_runs_df['timestamp'] = pd.to_datetime(rag_runs_df['timestamp'])
-rag_runs_df = rag_runs_df.sort_values('timestamp')
-
 # Get unique models
-available_models = sorted(rag_runs_df['model_name'].unique())
+available_models = list(rag_runs_df['model_name'].cat.categories)
 
 # Model selector
 selected_models = st.sidebar.multiselect(
@@ -89,10 +62,12 @@ selected_models = st.sidebar.multiselect(
 
 # Filter data by selected models and recall threshold
 if selected_models:
-    filtered_df = rag_runs_df[rag_runs_df['model_name'].isin(selected_models)]
+    # One combined mask, so the frame is sliced once for all charts and tables below
     min_recall = recall_threshold_slider / 100.0
+    keep = rag_runs_df['model_name'].isin(selected_models)
     if min_recall > 0:
-        filtered_df = filtered_df[filtered_df['avg_recall'] >= min_recall]
+        keep &= rag_runs_df['avg_recall'] >= min_recall
+    filtered_df = rag_runs_df[keep]
 else:
     st.warning("Please select at least one model to display")
     st.stop()
@@ -103,38 +78,62 @@ else:
 
 st.header("🚨 RAG Drift Detection Alerts")
 
-drift_cols = st.columns(len(selected_models))
-drift_threshold_decimal = drift_threshold / 100.0  # Convert to decimal
-
-for idx, model in enumerate(selected_models):
-    with drift_cols[idx]:
-        drift_data = api.get_rag_drift(model, threshold=drift_threshold_decimal)
-
-        if drift_data:
-            has_drifted = drift_data.get("has_drifted", False)
-            recall_drop = drift_data.get("recall_drop", 0)
-            latest_run = drift_data.get("latest_run")
-            best_run = drift_data.get("best_run")
-
-            if has_drifted:
-                st.error(f"🔴 {model}")
-                st.metric(
-                    "Recall Drop",
-                    f"{recall_drop:.1%}",
-                    delta=f"-{recall_drop:.1%}",
-                    delta_color="inverse"
-                )
-            else:
-                st.success(f"✅ {model}")
-                st.metric(
-                    "Recall Drop",
-                    f"{recall_drop:.1%}",
-                    delta=f"{recall_drop:.1%}" if recall_drop >= 0 else f"-{abs(recall_drop):.1%}",
-                    delta_color="normal"
-                )
-
-            if latest_run and best_run:
-                st.caption(f"Latest: {latest_run['avg_recall']:.1%} | Best: {best_run['avg_recall']:.1%}")
+
+@st.fragment
+def render_drift_alerts(selected_models):
+    """Drift threshold and per-model alerts; a fragment, so moving the threshold reruns only this block."""
+    drift_threshold = st.slider(
+        "Drift Alert Threshold (%)",
+        min_value=1,
+        max_value=10,
+        value=5,
+        help="Alert when recall drops by this percentage",
+        key="rag_drift_threshold"
+    )
+
+    drift_cols = st.columns(len(selected_models))
+    drift_threshold_decimal = drift_threshold / 100.0  # Convert to decimal
+
+    # Issue all drift requests up front, concurrently, before rendering the columns
+    # (failures raise, so they are never cached)
+    try:
+        drift_results = load_rag_drift_batch(tuple(selected_models), drift_threshold_decimal)
+    except APIError as e:
+        st.error(f"API Error: {e}")
+        return
+
+    for idx, model in enumerate(selected_models):
+        with drift_cols[idx]:
+            drift_data = drift_results.get(model)
+
+            if drift_data:
+                has_drifted = drift_data.get("has_drifted", False)
+                recall_drop = drift_data.get("recall_drop", 0)
+                latest_run = drift_data.get("latest_run")
+                best_run = drift_data.get("best_run")
+
+                if has_drifted:
+                    st.error(f"🔴 {model}")
+                    st.metric(
+                        "Recall Drop",
+                        f"{recall_drop:.1%}",
+                        delta=f"-{recall_drop:.1%}",
+                        delta_color="inverse"
+                    )
+                else:
+                    st.success(f"✅ {model}")
+                    st.metric(
+                        "Recall Drop",
+                        f"{recall_drop:.1%}",
+                        delta=f"{recall_drop:.1%}" if recall_drop >= 0 else f"-{abs(recall_drop):.1%}",
+                        delta_color="normal"
+                    )
+
+                if latest_run and best_run:
+                    st.caption(f"Latest: {latest_run['avg_recall']:.1%} | Best: {best_run['avg_recall']:.1%}")
+
+
+render_drift_alerts(selected_models)
 
 st.divider()
 
@@ -144,26 +143,22 @@ st.divider()
 
 st.header("📊 Key Metrics Overview")
 
-# Calculate aggregate stats
-latest_runs_per_model = filtered_df.groupby('model_name').last()
+# All four averages in one reduction
+means = filtered_df[['avg_precision', 'avg_recall', 'avg_answer_score', 'avg_grounding_score']].mean()
 
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    avg_precision = filtered_df['avg_precision'].mean()
-    st.metric("Avg Precision@K", f"{avg_precision:.1%}")
+    st.metric("Avg Precision@K", f"{means['avg_precision']:.1%}")
 
 with col2:
-    avg_recall = filtered_df['avg_recall'].mean()
-    st.metric("Avg Recall@K", f"{avg_recall:.1%}")
+    st.metric("Avg Recall@K", f"{means['avg_recall']:.1%}")
 
 with col3:
-    avg_answer_score = filtered_df['avg_answer_score'].mean()
-    st.metric("Avg Answer Score", f"{avg_answer_score:.1%}")
+    st.metric("Avg Answer Score", f"{means['avg_answer_score']:.1%}")
 
 with col4:
-    avg_grounding = filtered_df['avg_grounding_score'].mean()
-    st.metric("Avg Grounding Score", f"{avg_grounding:.1%}")
+    st.metric("Avg Grounding Score", f"{means['avg_grounding_score']:.1%}")
 
 st.divider()
 
@@ -171,43 +166,73 @@ st.divider()
 # RETRIEVAL QUALITY OVER TIME
 # ============================================================================
 
+def build_metric_trend_figure(filtered_df, selected_models, metrics, line_dashes, title, yaxis_title, yaxis_range=None):
+    """
+    Build a per-model line chart of two run metrics over time in one px.line call
+    (Plotly imported on first use).
+
+    The metric columns are melted into a long frame, so colour encodes the
+    model and dash style encodes the metric.
+
+    Args:
+        filtered_df: RAG runs sorted by timestamp
+        selected_models: Models to plot, in legend order
+        metrics: Column name -> legend label for each plotted metric
+        line_dashes: Legend label -> Plotly dash style
+        title: Chart title
+        yaxis_title: Y-axis title
+        yaxis_range: Optional fixed [min, max] for the y-axis
+    """
+    import plotly.express as px
+
+    long_df = filtered_df.melt(
+        id_vars=['timestamp', 'model_name'],
+        value_vars=list(metrics),
+        var_name='metric',
+        value_name='value'
+    )
+    long_df['metric'] = long_df['metric'].map(metrics)
+
+    fig = px.line(
+        long_df,
+        x='timestamp',
+        y='value',
+        color='model_name',
+        line_dash='metric',
+        line_dash_map=line_dashes,
+        category_orders={'model_name': selected_models, 'metric': list(metrics.values())},
+        markers=True
+    )
+
+    fig.update_layout(
+        title=title,
+        xaxis_title="Timestamp",
+        yaxis_title=yaxis_title,
+        legend_title_text=None,
+        hovermode='x unified',
+        height=500
+    )
+    if yaxis_range:
+        fig.update_yaxes(range=yaxis_range)
+
+    return fig
+
+
 st.header("📈 Retrieval Quality Over Time")
 
 tab1, tab2, tab3 = st.tabs(["Precision & Recall", "Answer Quality", "Performance"])
 
 with tab1:
-    fig = go.Figure()
-
-    for model in selected_models:
-        model_data = filtered_df[filtered_df['model_name'] == model]
-
-        # Precision line
-        fig.add_trace(go.Scatter(
-            x=model_data['timestamp'],
-            y=model_data['avg_precision'],
-            name=f"{model} - Precision",
-            mode='lines+markers',
-            line=dict(dash='dot')
-        ))
-
-        # Recall line
-        fig.add_trace(go.Scatter(
-            x=model_data['timestamp'],
-            y=model_data['avg_recall'],
-            name=f"{model} - Recall",
-            mode='lines+markers',
-            line=dict(dash='solid')
-        ))
-
-    fig.update_layout(
+    fig = build_metric_trend_figure(
+        filtered_df,
+        selected_models,
+        metrics={'avg_precision': 'Precision', 'avg_recall': 'Recall'},
+        line_dashes={'Precision': 'dot', 'Recall': 'solid'},
         title="Precision@K and Recall@K Over Time",
-        xaxis_title="Timestamp",
         yaxis_title="Score (0-1)",
-        hovermode='x unified',
-        yaxis=dict(range=[0, 1]),
-        height=500
+        yaxis_range=[0, 1]
     )
-    
+
     apply_plot_theme(fig)
 
     st.plotly_chart(fig, use_container_width=True, theme=None)
@@ -219,37 +244,16 @@ with tab1:
     """)
 
 with tab2:
-    fig2 = go.Figure()
-
-    for model in selected_models:
-        model_data = filtered_df[filtered_df['model_name'] == model]
-
-        # Answer score line
-        fig2.add_trace(go.Scatter(
-            x=model_data['timestamp'],
-            y=model_data['avg_answer_score'],
-            name=f"{model} - Answer",
-            mode='lines+markers'
-        ))
-
-        # Grounding score line
-        fig2.add_trace(go.Scatter(
-            x=model_data['timestamp'],
-            y=model_data['avg_grounding_score'],
-            name=f"{model} - Grounding",
-            mode='lines+markers',
-            line=dict(dash='dash')
-        ))
-
-    fig2.update_layout(
+    fig2 = build_metric_trend_figure(
+        filtered_df,
+        selected_models,
+        metrics={'avg_answer_score': 'Answer', 'avg_grounding_score': 'Grounding'},
+        line_dashes={'Answer': 'solid', 'Grounding': 'dash'},
         title="Answer Correctness & Grounding Over Time",
-        xaxis_title="Timestamp",
         yaxis_title="Score (0-1)",
-        hovermode='x unified',
-        yaxis=dict(range=[0, 1]),
-        height=500
+        yaxis_range=[0, 1]
     )
-    
+
     apply_plot_theme(fig2)
 
     st.plotly_chart(fig2, use_container_width=True, theme=None)
@@ -261,36 +265,15 @@ with tab2:
     """)
 
 with tab3:
-    fig3 = go.Figure()
-
-    for model in selected_models:
-        model_data = filtered_df[filtered_df['model_name'] == model]
-
-        # Retrieval time
-        fig3.add_trace(go.Scatter(
-            x=model_data['timestamp'],
-            y=model_data['avg_retrieval_time'],
-            name=f"{model} - Retrieval",
-            mode='lines+markers'
-        ))
-
-        # Generation time
-        fig3.add_trace(go.Scatter(
-            x=model_data['timestamp'],
-            y=model_data['avg_generation_time'],
-            name=f"{model} - Generation",
-            mode='lines+markers',
-            line=dict(dash='dash')
-        ))
-
-    fig3.update_layout(
+    fig3 = build_metric_trend_figure(
+        filtered_df,
+        selected_models,
+        metrics={'avg_retrieval_time': 'Retrieval', 'avg_generation_time': 'Generation'},
+        line_dashes={'Retrieval': 'solid', 'Generation': 'dash'},
         title="Latency Breakdown: Retrieval vs Generation",
-        xaxis_title="Timestamp",
-        yaxis_title="Time (seconds)",
-        hovermode='x unified',
-        height=500
+        yaxis_title="Time (seconds)"
     )
-    
+
     apply_plot_theme(fig3)
 
     st.plotly_chart(fig3, use_container_width=True, theme=None)
@@ -303,26 +286,22 @@ st.divider()
 
 st.header("🔬 Model Comparison Matrix")
 
-# Get latest run for each model
-comparison_data = []
-for model in selected_models:
-    model_data = filtered_df[filtered_df['model_name'] == model]
-    if not model_data.empty:
-        latest = model_data.iloc[-1]
-        comparison_data.append({
-            'Model': model,
-            'Precision@K': f"{latest['avg_precision']:.2%}",
-            'Recall@K': f"{latest['avg_recall']:.2%}",
-            'F1@K': f"{latest['avg_f1']:.2%}",
-            'MRR': f"{latest['avg_mrr']:.3f}",
-            'Answer Score': f"{latest['avg_answer_score']:.2%}",
-            'Grounding': f"{latest['avg_grounding_score']:.2%}",
-            'Retrieval Time': f"{latest['avg_retrieval_time']:.2f}s",
-            'Total Cost': f"${latest['total_cost']:.4f}",
-            'Questions': latest['total_questions']
-        })
-
-comparison_df = pd.DataFrame(comparison_data)
+# Get latest run for each model (filtered_df is sorted by timestamp), in selection order
+latest = filtered_df.groupby('model_name', sort=False, observed=True).tail(1).set_index('model_name')
+latest = latest.loc[[model for model in selected_models if model in latest.index]]
+
+comparison_df = pd.DataFrame({
+    'Model': latest.index,
+    'Precision@K': latest['avg_precision'].map('{:.2%}'.format).values,
+    'Recall@K': latest['avg_recall'].map('{:.2%}'.format).values,
+    'F1@K': latest['avg_f1'].map('{:.2%}'.format).values,
+    'MRR': latest['avg_mrr'].map('{:.3f}'.format).values,
+    'Answer Score': latest['avg_answer_score'].map('{:.2%}'.format).values,
+    'Grounding': latest['avg_grounding_score'].map('{:.2%}'.format).values,
+    'Retrieval Time': latest['avg_retrieval_time'].map('{:.2f}s'.format).values,
+    'Total Cost': latest['total_cost'].map('${:.4f}'.format).values,
+    'Questions': latest['total_questions'].values
+})
 st.dataframe(comparison_df, use_container_width=True, hide_index=True)
 
 st.divider()
@@ -333,35 +312,25 @@ st.divider()
 
 st.header("📜 Recent RAG Evaluation Runs")
 
-# Prepare display dataframe
-display_df = filtered_df[['id', 'model_name', 'timestamp', 'avg_precision', 'avg_recall',
-                           'avg_f1', 'avg_answer_score', 'avg_grounding_score',
-                           'total_cost', 'total_questions']].copy()
-
-display_df = display_df.rename(columns={
-    'id': 'Run ID',
-    'model_name': 'Model',
-    'timestamp': 'Timestamp',
-    'avg_precision': 'Precision',
-    'avg_recall': 'Recall',
-    'avg_f1': 'F1',
-    'avg_answer_score': 'Answer Score',
-    'avg_grounding_score': 'Grounding',
-    'total_cost': 'Cost',
-    'total_questions': 'Questions'
+# Build the display frame in one constructor, newest first (filtered_df is sorted by timestamp)
+history_df = filtered_df.iloc[::-1]
+pct_cols = ['avg_precision', 'avg_recall', 'avg_f1', 'avg_answer_score', 'avg_grounding_score']
+# One vectorized pass per format instead of a lambda per cell
+pct_text = np.char.mod('%.1f%%', history_df[pct_cols].to_numpy() * 100)
+
+display_df = pd.DataFrame({
+    'Run ID': history_df['id'].values,
+    'Model': history_df['model_name'].values,
+    'Timestamp': history_df['timestamp'].values,
+    'Precision': pct_text[:, 0],
+    'Recall': pct_text[:, 1],
+    'F1': pct_text[:, 2],
+    'Answer Score': pct_text[:, 3],
+    'Grounding': pct_text[:, 4],
+    'Cost': np.char.mod('$%.4f', history_df['total_cost'].to_numpy()),
+    'Questions': history_df['total_questions'].values
 })
 
-# Format percentages and costs
-display_df['Precision'] = display_df['Precision'].apply(lambda x: f"{x:.1%}")
-display_df['Recall'] = display_df['Recall'].apply(lambda x: f"{x:.1%}")
-display_df['F1'] = display_df['F1'].apply(lambda x: f"{x:.1%}")
-display_df['Answer Score'] = display_df['Answer Score'].apply(lambda x: f"{x:.1%}")
-display_df['Grounding'] = display_df['Grounding'].apply(lambda x: f"{x:.1%}")
-display_df['Cost'] = display_df['Cost'].apply(lambda x: f"${x:.4f}")
-
-# Sort by timestamp descending
-display_df = display_df.sort_values('Timestamp', ascending=False)
-
 st.dataframe(display_df, use_container_width=True, hide_index=True)
 
 # ============================================================================
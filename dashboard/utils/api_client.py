@@ -2,23 +2,77 @@
 API Client for FastAPI Backend
 Handles all HTTP communication with the evaluation API.
 """
+import math
+import orjson
 import requests
-from typing import Optional, List, Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Callable
 import streamlit as st
 
 # Base URL for the FastAPI backend
 BASE_URL = "http://127.0.0.1:8000"
 
+# Upper bound on parallel requests when fanning out per-model calls.
+# Fan-outs use a thread pool over one pooled keep-alive Session rather than an
+# async client: Streamlit scripts are synchronous and the local uvicorn API
+# speaks HTTP/1.1 only, so HTTP/2 multiplexing would not apply.
+MAX_CONCURRENT_REQUESTS = 8
+
+# Connections kept per host. The API client is shared by every browser session
+# (st.cache_resource), so several sessions' fan-outs can overlap; a pool smaller
+# than that churns connections instead of reusing them.
+POOL_MAXSIZE = 32
+
+# API max page_size for /rag-runs
+RAG_RUNS_PAGE_SIZE = 100
+
+
+class APIError(Exception):
+    """An API request failed: connection error, HTTP error status, or a body that is not JSON."""
+
+
+def create_session(retry: bool = False) -> requests.Session:
+    """
+    Create a keep-alive session with a connection pool sized for our fan-out.
+
+    Args:
+        retry: Retry GETs twice on connection errors and 502/503/504 with a
+            short backoff. Off for health probes, which should fail fast.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504]) if retry else 0
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 
 class APIClient:
     """Client for interacting with the Eval Dashboard API."""
 
     def __init__(self, base_url: str = BASE_URL):
         self.base_url = base_url
-        self.session = requests.Session()
+        self.session = create_session(retry=True)
 
-    def _get(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
-        """Make a GET request to the API."""
+    def _get(
+        self,
+        endpoint: str,
+        params: Optional[Dict] = None,
+        raise_errors: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Make a GET request to the API.
+
+        Failures are shown with st.error and return None, unless raise_errors
+        is set: then an APIError is raised and nothing is rendered, which is
+        what worker threads (no Streamlit script context) and cached loaders
+        (which must not cache a failure) need.
+        """
         try:
             response = self.session.get(
                 f"{self.base_url}{endpoint}",
@@ -26,12 +80,20 @@ class APIClient:
                 timeout=10
             )
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            # orjson decodes the raw bytes directly, skipping requests' text decode
+            return orjson.loads(response.content)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            if raise_errors:
+                raise APIError(str(e)) from e
             st.error(f"API Error: {str(e)}")
             return None
 
-    def _post(self, endpoint: str, data: Optional[Dict] = None) -> Optional[Dict[str, Any]]:
+    def _post(
+        self,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        show_error: bool = True
+    ) -> Optional[Dict[str, Any]]:
         """Make a POST request to the API."""
         try:
             response = self.session.post(
@@ -40,11 +102,32 @@ class APIClient:
                 timeout=30
             )
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            st.error(f"API Error: {str(e)}")
+            return orjson.loads(response.content)
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            if show_error:
+                st.error(f"API Error: {str(e)}")
             return None
 
+    def _map_concurrent(self, fetch: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """
+        Call fetch on every item from a thread pool, returning results in item order.
+
+        Worker threads have no Streamlit script context, so fetch must not
+        call st.* (use raise_errors=True); an APIError it raises is returned
+        in place of that item's result for the caller to report.
+        """
+        if not items:
+            return []
+
+        def run(item):
+            try:
+                return fetch(item)
+            except APIError as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(items) or 1)) as executor:
+            return list(executor.map(run, items))
+
     # Health check
     def get_health(self) -> Optional[Dict[str, Any]]:
         """Check API health status."""
@@ -61,7 +144,8 @@ class APIClient:
         page: int = 1,
         page_size: int = 20,
         model: Optional[str] = None,
-        min_accuracy: Optional[float] = None
+        min_accuracy: Optional[float] = None,
+        raise_errors: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
         Get paginated list of evaluation runs.
@@ -71,6 +155,7 @@ class APIClient:
             page_size: Items per page
             model: Filter by model name
             min_accuracy: Filter by minimum accuracy
+            raise_errors: Raise APIError instead of showing st.error
 
         Returns:
             Dict with 'total', 'page', 'page_size', and 'runs' list
@@ -84,27 +169,29 @@ class APIClient:
         if min_accuracy is not None:
             params["min_accuracy"] = min_accuracy
 
-        return self._get("/runs", params=params)
+        return self._get("/runs", params=params, raise_errors=raise_errors)
 
-    def get_run_detail(self, run_id: int) -> Optional[Dict[str, Any]]:
+    def get_run_detail(self, run_id: int, raise_errors: bool = False) -> Optional[Dict[str, Any]]:
         """
         Get detailed results for a specific run.
 
         Args:
             run_id: Unique identifier for the run
+            raise_errors: Raise APIError instead of showing st.error
 
         Returns:
             Dict with 'run', 'evaluations', and 'category_breakdown'
         """
-        return self._get(f"/run/{run_id}")
+        return self._get(f"/run/{run_id}", raise_errors=raise_errors)
 
     # Models endpoints
-    def get_models(self, days: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    def get_models(self, days: Optional[int] = None, raise_errors: bool = False) -> Optional[Dict[str, Any]]:
         """
         Get statistics for all available models.
 
         Args:
             days: Optional filter to only include runs from the last N days (e.g., 7, 30)
+            raise_errors: Raise APIError instead of showing st.error
 
         Returns:
             Dict with 'models' list containing ModelStats for each model
@@ -112,22 +199,74 @@ class APIClient:
         params = {}
         if days:
             params["days"] = days
-        return self._get("/models", params=params if params else None)
+        return self._get("/models", params=params if params else None, raise_errors=raise_errors)
 
     # Drift endpoints
-    def get_drift(self, model_name: str, threshold: float = 0.05) -> Optional[Dict[str, Any]]:
+    def get_drift(
+        self,
+        model_name: str,
+        threshold: float = 0.05,
+        raise_errors: bool = False
+    ) -> Optional[Dict[str, Any]]:
         """
         Analyze drift for a specific model.
 
         Args:
             model_name: Name of the model to analyze
             threshold: Accuracy drop threshold (default 5%)
+            raise_errors: Raise APIError instead of showing st.error
 
         Returns:
             Dict with drift analysis including latest_run, best_run, has_drifted, accuracy_drop
         """
         params = {"threshold": threshold}
-        return self._get(f"/drift/{model_name}", params=params)
+        return self._get(f"/drift/{model_name}", params=params, raise_errors=raise_errors)
+
+    def get_drift_batch(self, models: List[str], threshold: float = 0.05) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze drift for several models in a single request.
+
+        Falls back to concurrent per-model get_drift() calls when the API has
+        no batch endpoint (e.g. an older backend).
+
+        Args:
+            models: Names of the models to analyze
+            threshold: Accuracy drop threshold (default 5%)
+
+        Returns:
+            Dict keyed by model name with the same payload as get_drift();
+            models without runs are omitted
+
+        Raises:
+            APIError: If the per-model fallback failed for any model
+        """
+        data = self._post(
+            "/drift/batch",
+            data={"models": models, "threshold": threshold},
+            show_error=False
+        )
+        if data:
+            return data["results"]
+
+        # Independent I/O-bound GETs: overlap them so total time ~ slowest request
+        drift_results = self._map_concurrent(
+            lambda model: self.get_drift(model, threshold=threshold, raise_errors=True),
+            models
+        )
+        return self._collect_by_model(models, drift_results)
+
+    @staticmethod
+    def _collect_by_model(models: List[str], results: List[Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Key fan-out results by model.
+
+        Raises one APIError naming every failed model, so callers (and the
+        cached loaders above them) never keep a partial result.
+        """
+        failures = [f"{model}: {result}" for model, result in zip(models, results) if isinstance(result, APIError)]
+        if failures:
+            raise APIError("; ".join(failures))
+        return {model: result for model, result in zip(models, results) if result}
 
     # Evaluation trigger
     def run_evaluation(
@@ -163,7 +302,8 @@ class APIClient:
         page: int = 1,
         page_size: int = 20,
         model: Optional[str] = None,
-        min_recall: Optional[float] = None
+        min_recall: Optional[float] = None,
+        raise_errors: bool = False
     ) -> Optional[Dict[str, Any]]:
         """
         Get paginated list of RAG evaluation runs.
@@ -173,6 +313,7 @@ class APIClient:
             page_size: Items per page
             model: Filter by model name
             min_recall: Filter by minimum recall
+            raise_errors: Raise APIError instead of showing st.error
 
         Returns:
             Dict with 'total', 'page', 'page_size', and 'runs' list
@@ -186,7 +327,36 @@ class APIClient:
         if min_recall is not None:
             params["min_recall"] = min_recall
 
-        return self._get("/rag-runs", params=params)
+        return self._get("/rag-runs", params=params, raise_errors=raise_errors)
+
+    def get_rag_runs_all(self) -> List[Dict[str, Any]]:
+        """
+        Get every RAG evaluation run, fetching pages after the first concurrently.
+
+        Returns:
+            List of RAG run dicts in API order (newest first); empty if none
+
+        Raises:
+            APIError: If any page could not be fetched, so callers never see
+                (or cache) a partial list
+        """
+        first = self.get_rag_runs(page=1, page_size=RAG_RUNS_PAGE_SIZE, raise_errors=True)
+        if not first or not first.get("runs"):
+            return []
+
+        all_runs = list(first["runs"])
+        remaining_pages = range(2, math.ceil(first.get("total", 0) / RAG_RUNS_PAGE_SIZE) + 1)
+        pages = self._map_concurrent(
+            lambda page: self.get_rag_runs(page=page, page_size=RAG_RUNS_PAGE_SIZE, raise_errors=True),
+            list(remaining_pages)
+        )
+        # Results come back in page order, so runs keep the API's ordering
+        for runs_data in pages:
+            if isinstance(runs_data, APIError):
+                raise runs_data
+            all_runs.extend(runs_data.get("runs", []))
+
+        return all_runs
 
     def get_rag_run_detail(self, run_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -200,19 +370,52 @@ class APIClient:
         """
         return self._get(f"/rag-run/{run_id}")
 
-    def get_rag_drift(self, model_name: str, threshold: float = 0.05) -> Optional[Dict[str, Any]]:
+    def get_rag_drift(
+        self,
+        model_name: str,
+        threshold: float = 0.05,
+        raise_errors: bool = False
+    ) -> Optional[Dict[str, Any]]:
         """
         Analyze RAG drift for a specific model.
 
         Args:
             model_name: Name of the model to analyze
             threshold: Recall drop threshold (default 5%)
+            raise_errors: Raise APIError instead of showing st.error
 
         Returns:
             Dict with RAG drift analysis including latest_run, best_run, has_drifted, recall_drop
         """
         params = {"threshold": threshold}
-        return self._get(f"/rag-drift/{model_name}", params=params)
+        return self._get(f"/rag-drift/{model_name}", params=params, raise_errors=raise_errors)
+
+    def get_rag_drift_batch(self, models: List[str], threshold: float = 0.05) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze RAG drift for several models with concurrent per-model requests.
+
+        Args:
+            models: Names of the models to analyze
+            threshold: Recall drop threshold (default 5%)
+
+        Returns:
+            Dict keyed by model name with the same payload as get_rag_drift();
+            models without runs are omitted
+
+        Raises:
+            APIError: If any model's request failed
+        """
+        drift_results = self._map_concurrent(
+            lambda model: self.get_rag_drift(model, threshold=threshold, raise_errors=True),
+            models
+        )
+        return self._collect_by_model(models, drift_results)
+
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """Get cached pooled session for ad-hoc requests (health probes, etc.)."""
+    return create_session()
 
 
 # Singleton instance
@@ -0,0 +1,273 @@
+"""
+Cached Data Loaders
+Memoizes API fetches shared across dashboard pages so widget-triggered reruns
+don't repeat HTTP round trips.
+"""
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+import pandas as pd
+import streamlit as st
+
+from utils.api_client import get_api_client, APIError, MAX_CONCURRENT_REQUESTS
+
+# API max page_size for /runs; one request covers typical run histories
+RUNS_PAGE_SIZE = 1000
+
+# Model family used as the cost-savings baseline on Model Comparison
+BASELINE_MODEL_NAME = "gpt-4o"
+
+# Session-state key holding the assembled runs DataFrame and when it was built
+RUNS_DF_STATE_KEY = "_runs_df"
+
+# Compact dtypes for run/evaluation frames; the values are only displayed and charted
+COMPACT_DTYPES = {
+    'accuracy': 'float32',
+    'avg_accuracy': 'float32',
+    'best_accuracy': 'float32',
+    'worst_accuracy': 'float32',
+    'avg_cost': 'float32',
+    'avg_latency': 'float32',
+    'total_cost': 'float32',
+    'judge_score': 'float32',
+    'latency': 'float32',
+    'cost': 'float32',
+    'avg_precision': 'float32',
+    'avg_recall': 'float32',
+    'avg_f1': 'float32',
+    'avg_mrr': 'float32',
+    'avg_answer_score': 'float32',
+    'avg_grounding_score': 'float32',
+    'avg_retrieval_time': 'float32',
+    'avg_generation_time': 'float32',
+    'total_runs': 'int32',
+    'total_questions': 'int16',
+    'model_name': 'category',
+    'category': 'category',
+}
+
+
+def coerce_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast metric columns to float32 and repeated strings to categoricals.
+
+    Halves the memory and the bytes st.dataframe / st.plotly_chart ship to the
+    browser; categorical model names also give sorted unique values for free
+    via .cat.categories. Columns not present in df are skipped.
+    """
+    return df.astype({col: dtype for col, dtype in COMPACT_DTYPES.items() if col in df.columns})
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_all_runs() -> List[Dict[str, Any]]:
+    """
+    Fetch every evaluation run, following pagination.
+
+    Cached for 30 seconds and keyed on nothing, so all pages in a session
+    share the same result. Any failed page raises instead, so a partial
+    run list is never cached.
+
+    Returns:
+        List of run dicts (empty if the API has no runs)
+
+    Raises:
+        APIError: If any page could not be fetched
+    """
+    api = get_api_client()
+    first = api.get_runs(page=1, page_size=RUNS_PAGE_SIZE, raise_errors=True)
+    if not first or not first.get("runs"):
+        return []
+
+    all_runs = list(first["runs"])
+    total = first.get("total")
+
+    if total is None:
+        # No total reported: walk pages until a short one arrives
+        page, last_page = 1, first["runs"]
+        while len(last_page) == RUNS_PAGE_SIZE:
+            page += 1
+            runs_data = api.get_runs(page=page, page_size=RUNS_PAGE_SIZE, raise_errors=True)
+            last_page = runs_data.get("runs", [])
+            all_runs.extend(last_page)
+        return all_runs
+
+    # Total known: fetch exactly the remaining pages, concurrently. Workers have
+    # no script context, so they raise; map() re-raises on this thread.
+    remaining_pages = range(2, math.ceil(total / RUNS_PAGE_SIZE) + 1)
+    if remaining_pages:
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_REQUESTS, len(remaining_pages))) as executor:
+            pages = executor.map(
+                lambda page: api.get_runs(page=page, page_size=RUNS_PAGE_SIZE, raise_errors=True),
+                remaining_pages
+            )
+            for runs_data in pages:
+                all_runs.extend(runs_data.get("runs", []))
+
+    return all_runs
+
+
+def get_runs_df(max_age_s: float = 30) -> pd.DataFrame:
+    """
+    Return all runs as a DataFrame, reused across pages for this session.
+
+    The frame is kept in st.session_state and rebuilt only once it is older
+    than max_age_s, so switching between Home and Run Detail neither
+    reassembles it nor shows two different run lists.
+
+    Args:
+        max_age_s: Seconds before the stored frame is considered stale
+
+    Returns:
+        DataFrame with one row per run (empty if there are no runs or the
+        API request failed; failures are shown with st.error and not stored)
+    """
+    now = time.time()
+    cached = st.session_state.get(RUNS_DF_STATE_KEY)
+    if cached and now - cached["t"] < max_age_s:
+        return cached["df"]
+
+    try:
+        runs = load_all_runs()
+    except APIError as e:
+        st.error(f"API Error: {e}")
+        return pd.DataFrame()
+
+    df = coerce_dtypes(pd.DataFrame(runs))
+    st.session_state[RUNS_DF_STATE_KEY] = {"df": df, "t": now}
+    return df
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def load_run_detail(run_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Fetch one run's detail (run summary, evaluations, category breakdown).
+
+    Keyed on run_id only, so filter and sort changes on the same run don't
+    re-download its evaluations.
+
+    Raises:
+        APIError: If the request failed; the failure is not cached
+    """
+    return get_api_client().get_run_detail(run_id, raise_errors=True)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_drift_batch(models: Tuple[str, ...], threshold: float) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch drift analysis for several models in one API call.
+
+    Args:
+        models: Model names (a tuple, so it can be part of the cache key)
+        threshold: Accuracy drop threshold as a decimal
+
+    Returns:
+        Dict keyed by model name; models without runs are omitted
+
+    Raises:
+        APIError: If drift could not be fetched for every model; nothing is cached
+    """
+    return get_api_client().get_drift_batch(list(models), threshold=threshold)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_models(days: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    Fetch per-model statistics, keyed on the time filter.
+
+    Args:
+        days: Only include runs from the last N days (None for all time)
+
+    Raises:
+        APIError: If the request failed; the failure is not cached
+    """
+    return get_api_client().get_models(days=days, raise_errors=True)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def load_models_df(days: Optional[int], sort_column: str, ascending: bool) -> Optional[pd.DataFrame]:
+    """
+    Per-model statistics as a DataFrame of models with runs, sorted for display.
+
+    Args:
+        days: Only include runs from the last N days (None for all time)
+        sort_column: Column to sort by
+        ascending: Sort direction
+
+    Returns:
+        Sorted DataFrame with an is_baseline flag column, or None if the
+        API returned no models
+
+    Raises:
+        APIError: If the request failed; the failure is not cached
+    """
+    models_data = load_models(days)
+    if not models_data or not models_data.get("models"):
+        return None
+
+    models_df = coerce_dtypes(pd.DataFrame(models_data["models"]))
+    models_df = models_df[models_df['total_runs'] > 0]
+    # Flag cost-savings baseline candidates once per fetch rather than on every rerun
+    models_df = models_df.assign(
+        is_baseline=models_df['model_name'].str.lower().str.contains(BASELINE_MODEL_NAME, regex=False)
+    )
+    return models_df.sort_values(by=sort_column, ascending=ascending)
+
+
+@st.cache_data(ttl=60, show_spinner="Loading RAG evaluation data...")
+def load_all_rag_runs() -> pd.DataFrame:
+    """
+    Fetch every RAG evaluation run as a compact DataFrame sorted by timestamp.
+
+    The whole fetch -> DataFrame -> dtypes -> parse -> sort pipeline is
+    cached for 60 seconds, so slider and model-selector reruns on RAG
+    Analysis get the prepared frame back without touching the API. The
+    spinner shows only on a cache miss.
+
+    Returns:
+        DataFrame with one row per RAG run (empty if there are no runs)
+
+    Raises:
+        APIError: If the runs could not be fetched; nothing is cached
+    """
+    rag_runs_df = pd.DataFrame(get_api_client().get_rag_runs_all())
+    if rag_runs_df.empty:
+        return rag_runs_df
+
+    rag_runs_df = coerce_dtypes(rag_runs_df)
+    # API timestamps are ISO 8601; an explicit format skips per-row inference
+    rag_runs_df['timestamp'] = pd.to_datetime(rag_runs_df['timestamp'], format='ISO8601')
+    # Stable sort, done once here; the page relies on this order and never re-sorts
+    return rag_runs_df.sort_values('timestamp', kind='mergesort', ignore_index=True)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def load_rag_drift_batch(models: Tuple[str, ...], threshold: float) -> Dict[str, Dict[str, Any]]:
+    """
+    Fetch RAG drift analysis for several models concurrently.
+
+    Args:
+        models: Model names (a tuple, so it can be part of the cache key)
+        threshold: Recall drop threshold as a decimal
+
+    Returns:
+        Dict keyed by model name; models without runs are omitted
+
+    Raises:
+        APIError: If drift could not be fetched for every model; nothing is cached
+    """
+    return get_api_client().get_rag_drift_batch(list(models), threshold=threshold)
+
+
+def render_refresh_button():
+    """Render a sidebar button that drops cached API data and reruns the page."""
+    if st.sidebar.button("🔄 Refresh data", help="Reload data from the API"):
+        load_all_runs.clear()
+        st.session_state.pop(RUNS_DF_STATE_KEY, None)
+        load_run_detail.clear()
+        load_drift_batch.clear()
+        load_models.clear()
+        load_models_df.clear()
+        load_all_rag_runs.clear()
+        load_rag_drift_batch.clear()
+        st.rerun()
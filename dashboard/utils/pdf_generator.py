@@ -2,66 +2,191 @@
 PDF Report Generator
 Creates executive-ready PDF reports with evaluation results, charts, and metrics.
 """
+import os
+
+from reportlab import rl_config
+
+# Skip ReportLab's per-attribute shape validation; read once when reportlab.graphics
+# is first imported, so it must be set before any drawing code loads.
+# Set PDFGEN_DEBUG=1 to keep the checks while developing report layouts.
+if not os.environ.get('PDFGEN_DEBUG'):
+    rl_config.shapeChecking = 0
+
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import (
-    SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer,
+    SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, Spacer,
     PageBreak, Image as RLImage
 )
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from datetime import datetime
 import plotly.express as px
 import pandas as pd
+import numpy as np
 from io import BytesIO
+import hashlib
 import tempfile
-import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import kaleido
+except ImportError:  # plotly reports the missing engine when a chart is rendered
+    kaleido = None
 
 # --- Layout Constants ---
 PAGE_MARGIN = 0.5 * inch
 PAGE_WIDTH, PAGE_HEIGHT = letter
 CONTENT_WIDTH = PAGE_WIDTH - (2 * PAGE_MARGIN)
+_QUARTER_COLS = [CONTENT_WIDTH / 4] * 4
+_PERF_MATRIX_COLS = [CONTENT_WIDTH * f for f in (0.08, 0.37, 0.14, 0.14, 0.14, 0.13)]
+_CAT_COLS = [CONTENT_WIDTH * f for f in (0.4, 0.2, 0.2, 0.2)]
+
+# --- Chart Rendering ---
+CHART_HEIGHT = 3 * inch
+# Render at the embedded size in points; scale=1.5 keeps text sharp without
+# rasterizing (and embedding) far more pixels than the page shows
+CHART_RENDER_SIZE = dict(width=int(CONTENT_WIDTH), height=int(CHART_HEIGHT), scale=1.5)
+# Rendered chart PNGs keyed by figure spec, so re-exporting the same data skips Kaleido.
+# Capped at CHART_CACHE_MAX_FILES, evicting the least recently used on each new render
+CHART_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'eval_dashboard_charts')
+CHART_CACHE_MAX_FILES = 256
+
+# Kaleido v1 can keep one browser alive for every render in the process instead of
+# launching Chromium per write_image; its server handles one caller at a time
+_KALEIDO_LOCK = threading.Lock()
+_kaleido_server_started = False
+
+
+def _write_chart_png(fig, path):
+    """Render fig to path, reusing a single Kaleido browser session across reports."""
+    global _kaleido_server_started
+    with _KALEIDO_LOCK:
+        fig.write_image(path, **CHART_RENDER_SIZE)
+        # Start the shared server only after a render has worked: if Chrome is
+        # missing, the server thread dies and later calls would block forever
+        if not _kaleido_server_started and hasattr(kaleido, 'start_sync_server'):
+            kaleido.start_sync_server(n=1, silence_warnings=True)
+            _kaleido_server_started = True
+
+
+def _prune_chart_cache():
+    """Delete the least recently used cached charts beyond CHART_CACHE_MAX_FILES."""
+    # In-flight renders use mkstemp's tmp* names; leave those alone
+    entries = [
+        e for e in os.scandir(CHART_CACHE_DIR)
+        if e.name.endswith('.png') and not e.name.startswith('tmp')
+    ]
+    if len(entries) <= CHART_CACHE_MAX_FILES:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    for e in entries[:len(entries) - CHART_CACHE_MAX_FILES]:
+        try: os.unlink(e.path)
+        except OSError: pass  # already removed by a concurrent prune
+
+
+@contextmanager
+def _temppath(suffix, dir):
+    """Yield a fresh closed file path in dir; the file is removed on exit unless moved away."""
+    fd, path = tempfile.mkstemp(suffix=suffix, dir=dir)
+    os.close(fd)
+    try:
+        yield path
+    finally:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
 
 class PDFReportGenerator:
     """Generate professional, clean PDF reports with comprehensive insights."""
 
+    # Colors (parsed once, shared by every report)
+    primary_color = colors.HexColor('#2563EB')
+    accent_color = colors.HexColor('#10B981')
+    text_primary = colors.HexColor('#111827')
+    text_secondary = colors.HexColor('#6B7280')
+    bg_light = colors.HexColor('#F9FAFB')
+
+    # Table styles never vary between reports; Table.setStyle only reads them
+    _summary_table_style = TableStyle([
+        ('BACKGROUND', (0,0), (-1,-1), bg_light),
+        ('TOPPADDING', (0,0), (-1,-1), 15),
+        ('BOTTOMPADDING', (0,0), (-1,-1), 15),
+        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+    ])
+    _run_summary_table_style = TableStyle([
+        ('BACKGROUND', (0,0), (-1,-1), bg_light),
+        ('TOPPADDING', (0,0), (-1,-1), 15),
+        ('BOTTOMPADDING', (0,0), (-1,-1), 15)
+    ])
+    _savings_table_style = TableStyle([
+        ('BACKGROUND', (0,0), (-1,-1), colors.HexColor('#ECFDF5')),
+        ('LEFTPADDING', (0,0), (-1,-1), 15),
+        ('RIGHTPADDING', (0,0), (-1,-1), 15),
+        ('TOPPADDING', (0,0), (-1,-1), 10),
+        ('BOTTOMPADDING', (0,0), (-1,-1), 10),
+    ])
+    _perf_matrix_table_style = TableStyle([
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0,0), (-1,0), 9),
+        ('LINEBELOW', (0,0), (-1,0), 1, text_primary),
+        ('TOPPADDING', (0,0), (-1,-1), 8),
+        ('BOTTOMPADDING', (0,0), (-1,-1), 8),
+        ('ALIGN', (2,0), (-1,-1), 'RIGHT'),
+        ('TEXTCOLOR', (0,0), (-1,0), text_secondary),
+    ])
+    _category_table_style = TableStyle([
+        ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
+        ('LINEBELOW', (0,0), (-1,0), 1, text_primary),
+        ('TOPPADDING', (0,0), (-1,-1), 8),
+        ('BOTTOMPADDING', (0,0), (-1,-1), 8),
+        ('ALIGN', (1,0), (-1,-1), 'RIGHT')
+    ])
+
+    # Sample stylesheet plus custom styles, built on first use; reports only read it
+    _shared_styles = None
+    _styles_lock = threading.Lock()
+    # Recoloured MetricVal variants, keyed by hex colour
+    _metric_val_styles = {}
+
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        
-        # Colors
-        self.primary_color = colors.HexColor('#2563EB')
-        self.accent_color = colors.HexColor('#10B981')
-        self.text_primary = colors.HexColor('#111827')
-        self.text_secondary = colors.HexColor('#6B7280')
-        self.bg_light = colors.HexColor('#F9FAFB')
-        
-        self._setup_custom_styles()
-        self._temp_files = []
+        self.styles = self._get_shared_styles()
 
-    def _setup_custom_styles(self):
+    @classmethod
+    def _get_shared_styles(cls):
+        with cls._styles_lock:
+            if cls._shared_styles is None:
+                styles = getSampleStyleSheet()
+                cls._setup_custom_styles(styles)
+                cls._shared_styles = styles
+        return cls._shared_styles
+
+    @classmethod
+    def _setup_custom_styles(cls, styles):
         """Setup styles with explicit leading to prevent text overlap."""
         
         # Title
-        if 'ReportTitle' in self.styles: self.styles.pop('ReportTitle')
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='ReportTitle',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=24,
             leading=30,
-            textColor=self.text_primary,
+            textColor=cls.text_primary,
             fontName='Helvetica-Bold',
             spaceAfter=10
         ))
 
         # Section Header
-        if 'SectionHeader' in self.styles: self.styles.pop('SectionHeader')
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='SectionHeader',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=14,
             leading=18,
-            textColor=self.primary_color,
+            textColor=cls.primary_color,
             fontName='Helvetica-Bold',
             spaceBefore=15,
             spaceAfter=10,
@@ -69,43 +194,46 @@ class PDFReportGenerator:
         ))
         
         # Metric Value (Large)
-        if 'MetricVal' in self.styles: self.styles.pop('MetricVal')
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='MetricVal',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=20,
             leading=24,
-            textColor=self.primary_color,
+            textColor=cls.primary_color,
             alignment=TA_CENTER,
             fontName='Helvetica-Bold'
         ))
 
         # Metric Label (Small)
-        if 'MetricLab' in self.styles: self.styles.pop('MetricLab')
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='MetricLab',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=9,
             leading=11,
-            textColor=self.text_secondary,
+            textColor=cls.text_secondary,
             alignment=TA_CENTER
         ))
 
         # Body Text
-        if 'CleanBody' in self.styles: self.styles.pop('CleanBody')
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='CleanBody',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=10,
             leading=15,
-            textColor=self.text_primary
+            textColor=cls.text_primary
         ))
 
     def _create_metric_box(self, label, value, color=None):
         """Simple vertical stack for a metric."""
         style = self.styles['MetricVal']
         if color:
-            style = ParagraphStyle('TempV', parent=style, textColor=color)
+            key = color.hexval()
+            colored = self._metric_val_styles.get(key)
+            if colored is None:
+                colored = self._metric_val_styles.setdefault(
+                    key, ParagraphStyle(f'MetricVal{key}', parent=style, textColor=color)
+                )
+            style = colored
         return [
             Paragraph(value, style),
             Paragraph(label, self.styles['MetricLab'])
@@ -113,41 +241,60 @@ class PDFReportGenerator:
 
     def _create_plotly_image(self, fig):
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.png') as tmp:
-                path = tmp.name
             fig.update_layout(
                 plot_bgcolor='white', 
                 paper_bgcolor='white', 
                 margin=dict(l=10,r=10,t=30,b=10),
                 font=dict(size=10)
             )
-            fig.write_image(path, width=1000, height=500, scale=2, engine='kaleido')
-            self._temp_files.append(path)
-            return RLImage(path, width=CONTENT_WIDTH, height=3*inch)
+            spec = f"{fig.to_json()}|{CHART_RENDER_SIZE}".encode()
+            path = os.path.join(CHART_CACHE_DIR, f"{hashlib.blake2b(spec, digest_size=16).hexdigest()}.png")
+            try:
+                # Cache hit: bump the mtime so pruning treats it as recently used
+                os.utime(path)
+            except FileNotFoundError:
+                os.makedirs(CHART_CACHE_DIR, exist_ok=True)
+                # Render to a private name, then rename, so readers never see a partial PNG
+                with _temppath('.png', CHART_CACHE_DIR) as tmp_path:
+                    _write_chart_png(fig, tmp_path)
+                    os.replace(tmp_path, path)
+                _prune_chart_cache()
+            # Cached PNGs outlive this report; _temppath removes failed renders
+            return RLImage(path, width=CONTENT_WIDTH, height=CHART_HEIGHT)
         except: return None
 
-    def _cleanup(self):
-        for p in self._temp_files:
-            try: 
-                if os.path.exists(p): os.unlink(p)
-            except: pass
-        self._temp_files = []
-
-    def generate_model_comparison_report(self, models_df, output_path, title="Model Comparison Analysis"):
-        doc = SimpleDocTemplate(output_path, pagesize=letter, leftMargin=PAGE_MARGIN, rightMargin=PAGE_MARGIN, topMargin=PAGE_MARGIN, bottomMargin=PAGE_MARGIN)
+    def generate_model_comparison_report(self, models_df, output, title="Model Comparison Analysis"):
+        """Build the comparison report into output (a file path or a binary file-like object)."""
+        doc = SimpleDocTemplate(output, pagesize=letter, leftMargin=PAGE_MARGIN, rightMargin=PAGE_MARGIN, topMargin=PAGE_MARGIN, bottomMargin=PAGE_MARGIN)
         story = []
+        styles = self.styles
+        section_style, body_style = styles['SectionHeader'], styles['CleanBody']
+        generated_on = datetime.now().strftime('%B %d, %Y')
 
         # 1. Header
-        story.append(Paragraph(title, self.styles['ReportTitle']))
-        story.append(Paragraph(f"Comparative Performance Analysis • Generated on {datetime.now().strftime('%B %d, %Y')}", self.styles['Normal']))
+        story.append(Paragraph(title, styles['ReportTitle']))
+        story.append(Paragraph(f"Comparative Performance Analysis • Generated on {generated_on}", styles['Normal']))
         story.append(Spacer(1, 0.2*inch))
 
         # 2. Executive Summary
-        story.append(Paragraph("Executive Summary", self.styles['SectionHeader']))
+        story.append(Paragraph("Executive Summary", section_style))
         
-        best = models_df.loc[models_df['avg_accuracy'].idxmax()]
-        cheap = models_df.loc[models_df['avg_cost'].idxmin()]
-        fast = models_df.loc[models_df['avg_latency'].idxmin()]
+        # Extremes and the weighted score (50% Acc, 30% Cost, 20% Latency) in one
+        # NumPy pass over the raw columns. Missing values are skipped, as idxmax/idxmin
+        # do: a NaN metric gives that model a NaN score, which nanargmax ignores
+        acc = models_df['avg_accuracy'].to_numpy(dtype=float)
+        cost = models_df['avg_cost'].to_numpy(dtype=float)
+        lat = models_df['avg_latency'].to_numpy(dtype=float)
+        score = (
+            0.5 * acc
+            + 0.3 * (1 - cost / (np.nanmax(cost, initial=0.0) or 1.0))
+            + 0.2 * (1 - lat / (np.nanmax(lat, initial=0.0) or 1.0))
+        )
+        best, cheap, fast, rec, baseline_model = (
+            models_df.iloc[i] for i in (
+                np.nanargmax(acc), np.nanargmin(cost), np.nanargmin(lat), np.nanargmax(score), np.nanargmax(cost)
+            )
+        )
 
         summary_data = [[
             self._create_metric_box("Peak Accuracy", f"{best['avg_accuracy']:.1%}"),
@@ -156,27 +303,12 @@ class PDFReportGenerator:
             self._create_metric_box("Models Compared", str(len(models_df)))
         ]]
         
-        st_table = Table(summary_data, colWidths=[CONTENT_WIDTH/4]*4)
-        st_table.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,-1), self.bg_light),
-            ('TOPPADDING', (0,0), (-1,-1), 15),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 15),
-            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ]))
+        st_table = Table(summary_data, colWidths=_QUARTER_COLS, style=self._summary_table_style)
         story.append(st_table)
         story.append(Spacer(1, 0.2*inch))
 
         # 3. Strategic Recommendation
-        story.append(Paragraph("Strategic Recommendation", self.styles['SectionHeader']))
-        
-        # Weighted Score Logic (50% Acc, 30% Cost, 20% Latency)
-        m_copy = models_df.copy()
-        m_copy['score'] = (
-            0.5 * m_copy['avg_accuracy'] + 
-            0.3 * (1 - m_copy['avg_cost'] / (m_copy['avg_cost'].max() or 1)) + 
-            0.2 * (1 - m_copy['avg_latency'] / (m_copy['avg_latency'].max() or 1))
-        )
-        rec = m_copy.loc[m_copy['score'].idxmax()]
+        story.append(Paragraph("Strategic Recommendation", section_style))
         
         rec_text = f"""
         <b>Recommended Model: {rec['model_name']}</b><br/>
@@ -184,13 +316,12 @@ class PDFReportGenerator:
         choice for production. It achieves an average accuracy of <b>{rec['avg_accuracy']:.1%}</b> with a 
         competitive cost of <b>${rec['avg_cost']:.4f}</b> per evaluation.
         """
-        story.append(Paragraph(rec_text, self.styles['CleanBody']))
+        story.append(Paragraph(rec_text, body_style))
         story.append(Spacer(1, 0.2*inch))
 
         # 4. Cost Impact Analysis
-        baseline_model = models_df.loc[models_df['avg_cost'].idxmax()]
         if baseline_model['model_name'] != rec['model_name']:
-            story.append(Paragraph("Projected Cost Impact", self.styles['SectionHeader']))
+            story.append(Paragraph("Projected Cost Impact", section_style))
             savings = baseline_model['avg_cost'] - rec['avg_cost']
             annual_savings = savings * 100 * 365 # 100 evals/day
             
@@ -201,46 +332,32 @@ class PDFReportGenerator:
             <b>Projected Annual Savings:</b> ${annual_savings:,.2f} (at 100 evals/day).
             """
             # Draw in a subtle green box
-            st_table = Table([[Paragraph(savings_text, self.styles['CleanBody'])]], colWidths=[CONTENT_WIDTH])
-            st_table.setStyle(TableStyle([
-                ('BACKGROUND', (0,0), (-1,-1), colors.HexColor('#ECFDF5')),
-                ('LEFTPADDING', (0,0), (-1,-1), 15),
-                ('RIGHTPADDING', (0,0), (-1,-1), 15),
-                ('TOPPADDING', (0,0), (-1,-1), 10),
-                ('BOTTOMPADDING', (0,0), (-1,-1), 10),
-            ]))
+            st_table = Table([[Paragraph(savings_text, body_style)]], colWidths=[CONTENT_WIDTH], style=self._savings_table_style)
             story.append(st_table)
             story.append(Spacer(1, 0.2*inch))
 
         # 5. Performance Matrix (Table)
-        story.append(Paragraph("Performance Matrix", self.styles['SectionHeader']))
-        lb_data = [['RANK', 'MODEL', 'AVG ACC', 'BEST ACC', 'COST', 'LATENCY']]
+        story.append(Paragraph("Performance Matrix", section_style))
         models_sorted = models_df.sort_values('avg_accuracy', ascending=False)
-        for i, (_, row) in enumerate(models_sorted.iterrows()):
-            lb_data.append([
-                str(i+1), 
-                row['model_name'], 
-                f"{row['avg_accuracy']:.1%}", 
-                f"{row['best_accuracy']:.1%}",
-                f"${row['avg_cost']:.4f}", 
-                f"{row['avg_latency']:.2f}s"
-            ])
+        # Format whole columns at once, then zip them into table rows
+        acc_text = np.char.mod('%.1f%%', models_sorted[['avg_accuracy', 'best_accuracy']].to_numpy(dtype=float) * 100)
+        lb_data = [['RANK', 'MODEL', 'AVG ACC', 'BEST ACC', 'COST', 'LATENCY']]
+        lb_data.extend(map(list, zip(
+            np.arange(1, len(models_sorted) + 1).astype(str),
+            models_sorted['model_name'].astype(str),
+            acc_text[:, 0],
+            acc_text[:, 1],
+            np.char.mod('$%.4f', models_sorted['avg_cost'].to_numpy(dtype=float)),
+            np.char.mod('%.2fs', models_sorted['avg_latency'].to_numpy(dtype=float))
+        )))
         
-        lt = Table(lb_data, colWidths=[CONTENT_WIDTH*0.08, CONTENT_WIDTH*0.37, CONTENT_WIDTH*0.14, CONTENT_WIDTH*0.14, CONTENT_WIDTH*0.14, CONTENT_WIDTH*0.13])
-        lt.setStyle(TableStyle([
-            ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0,0), (-1,0), 9),
-            ('LINEBELOW', (0,0), (-1,0), 1, self.text_primary),
-            ('TOPPADDING', (0,0), (-1,-1), 8),
-            ('BOTTOMPADDING', (0,0), (-1,-1), 8),
-            ('ALIGN', (2,0), (-1,-1), 'RIGHT'),
-            ('TEXTCOLOR', (0,0), (-1,0), self.text_secondary),
-        ]))
+        # LongTable lays out rows incrementally and repeats the header when it splits across pages
+        lt = LongTable(lb_data, colWidths=_PERF_MATRIX_COLS, repeatRows=1, style=self._perf_matrix_table_style)
         story.append(lt)
 
         # 6. Visual Analysis
         story.append(PageBreak())
-        story.append(Paragraph("Visual Performance Analysis", self.styles['SectionHeader']))
+        story.append(Paragraph("Visual Performance Analysis", section_style))
         img = self._create_plotly_image(px.scatter(
             models_df, 
             x='avg_cost', 
@@ -253,14 +370,15 @@ class PDFReportGenerator:
         if img: story.append(img)
 
         doc.build(story)
-        self._cleanup()
-        return output_path
+        return output
 
-    def generate_run_detail_report(self, run, evals_df, cats, output_path):
-        doc = SimpleDocTemplate(output_path, pagesize=letter, margin=PAGE_MARGIN)
+    def generate_run_detail_report(self, run, evals_df, cats, output):
+        """Build the run detail report into output (a file path or a binary file-like object)."""
+        doc = SimpleDocTemplate(output, pagesize=letter, margin=PAGE_MARGIN)
         story = []
-        story.append(Paragraph(f"Evaluation Run: {run['model_name']}", self.styles['ReportTitle']))
-        story.append(Paragraph(f"Run ID: {run['id']} • Timestamp: {run['timestamp']}", self.styles['Normal']))
+        styles = self.styles
+        story.append(Paragraph(f"Evaluation Run: {run['model_name']}", styles['ReportTitle']))
+        story.append(Paragraph(f"Run ID: {run['id']} • Timestamp: {run['timestamp']}", styles['Normal']))
         story.append(Spacer(1, 0.2*inch))
         
         summary_data = [[
@@ -269,47 +387,29 @@ class PDFReportGenerator:
             self._create_metric_box("Total Cost", f"${run['total_cost']:.4f}"),
             self._create_metric_box("Evaluations", str(len(evals_df)))
         ]]
-        st_table = Table(summary_data, colWidths=[CONTENT_WIDTH/4]*4)
-        st_table.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,-1), self.bg_light), 
-            ('TOPPADDING', (0,0), (-1,-1), 15), 
-            ('BOTTOMPADDING', (0,0), (-1,-1), 15)
-        ]))
+        st_table = Table(summary_data, colWidths=_QUARTER_COLS, style=self._run_summary_table_style)
         story.append(st_table)
         
         if cats:
-            story.append(Paragraph("Category Performance", self.styles['SectionHeader']))
+            story.append(Paragraph("Category Performance", styles['SectionHeader']))
             c_data = [['CATEGORY', 'COUNT', 'SCORE', 'LATENCY']]
             for c, m in cats.items():
                 c_data.append([c, str(m['count']), f"{m['avg_score']:.1%}", f"{m['avg_latency']:.2f}s"])
-            ct = Table(c_data, colWidths=[CONTENT_WIDTH*0.4, CONTENT_WIDTH*0.2, CONTENT_WIDTH*0.2, CONTENT_WIDTH*0.2])
-            ct.setStyle(TableStyle([
-                ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'), 
-                ('LINEBELOW', (0,0), (-1,0), 1, self.text_primary), 
-                ('TOPPADDING', (0,0), (-1,-1), 8), 
-                ('BOTTOMPADDING', (0,0), (-1,-1), 8), 
-                ('ALIGN', (1,0), (-1,-1), 'RIGHT')
-            ]))
+            ct = LongTable(c_data, colWidths=_CAT_COLS, repeatRows=1, style=self._category_table_style)
             story.append(ct)
 
         doc.build(story)
-        self._cleanup()
-        return output_path
+        return output
 
 def generate_model_comparison_pdf(df):
-    gen = PDFReportGenerator()
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp: path = tmp.name
-    gen.generate_model_comparison_report(df, path)
-    with open(path, 'rb') as f: b = BytesIO(f.read())
-    try: os.unlink(path)
-    except: pass
-    return b
+    # ReportLab writes straight into the buffer; no temp file round trip
+    buf = BytesIO()
+    PDFReportGenerator().generate_model_comparison_report(df, buf)
+    buf.seek(0)
+    return buf
 
 def generate_run_detail_pdf(run, df, cats):
-    gen = PDFReportGenerator()
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp: path = tmp.name
-    gen.generate_run_detail_report(run, df, cats, path)
-    with open(path, 'rb') as f: b = BytesIO(f.read())
-    try: os.unlink(path)
-    except: pass
-    return b
\ No newline at end of file
+    buf = BytesIO()
+    PDFReportGenerator().generate_run_detail_report(run, df, cats, buf)
+    buf.seek(0)
+    return buf
@@ -2,13 +2,36 @@
 Theme Manager - Dark/Light Mode Toggle
 Provides dynamic theme switching via CSS injection.
 """
+import re
+
 import streamlit as st
 
 
-def get_dark_mode_css() -> str:
-    """Return CSS for dark mode styling."""
-    return """
-    <style>
+# Shared by both themes; each theme adds its own rules to the same media query
+_RAW_MOBILE = """
+        /* Stack columns on mobile */
+        .stColumns {
+            flex-direction: column !important;
+        }
+
+        /* Make metrics stack vertically */
+        [data-testid="metric-container"] {
+            margin-bottom: 1rem;
+        }
+
+        /* Ensure charts are responsive */
+        .js-plotly-plot {
+            width: 100% !important;
+        }
+
+        /* Make tables scrollable */
+        [data-testid="stDataFrame"] {
+            overflow-x: auto;
+        }
+"""
+
+
+_RAW_DARK = """
     /* Dark mode styles */
     .stApp {
         background-color: #0e1117;
@@ -44,8 +67,11 @@ def get_dark_mode_css() -> str:
 
     /* Dataframes and Tables - INVERT STRATEGY */
     /* Since base theme is Light, st.dataframe renders white. We invert it to make it dark. */
+    /* Cells are drawn on a canvas from Streamlit's JS theme, so CSS colours cannot reach them; */
+    /* giving it its own layer keeps the filter from re-rasterizing the page on scroll. */
     [data-testid="stDataFrame"] {
         filter: invert(1) hue-rotate(180deg);
+        will-change: filter;
     }
 
     /* Table cells (for static st.table) */
@@ -126,12 +152,6 @@ def get_dark_mode_css() -> str:
         border-color: #30363d;
     }
 
-    /* Select boxes */
-    .stSelectbox > div > div {
-        background-color: #0d1117;
-        color: #c9d1d9;
-    }
-
     /* Number inputs */
     .stNumberInput > div > div > input {
         background-color: #0d1117 !important;
@@ -240,27 +260,7 @@ def get_dark_mode_css() -> str:
         .main-header {
             font-size: 2rem !important;
         }
-
-        /* Stack columns on mobile */
-        .stColumns {
-            flex-direction: column !important;
-        }
-
-        /* Make metrics stack vertically */
-        [data-testid="metric-container"] {
-            margin-bottom: 1rem;
-        }
-
-        /* Ensure charts are responsive */
-        .js-plotly-plot {
-            width: 100% !important;
-        }
-
-        /* Make tables scrollable */
-        [data-testid="stDataFrame"] {
-            overflow-x: auto;
-        }
-
+""" + _RAW_MOBILE + """
         /* Adjust button sizes */
         .stButton > button {
             width: 100%;
@@ -272,14 +272,10 @@ def get_dark_mode_css() -> str:
             width: 100% !important;
         }
     }
-    </style>
-    """
+"""
 
 
-def get_light_mode_css() -> str:
-    """Return CSS for light mode styling (minimal overrides)."""
-    return """
-    <style>
+_RAW_LIGHT = """
     /* Light mode - use default Streamlit styles with minor enhancements */
     .main-header {
         font-size: 3rem;
@@ -301,29 +297,35 @@ def get_light_mode_css() -> str:
         .main-header {
             font-size: 2rem;
         }
+""" + _RAW_MOBILE + """
+    }
+"""
 
-        /* Stack columns on mobile */
-        .stColumns {
-            flex-direction: column !important;
-        }
 
-        /* Make metrics stack vertically */
-        [data-testid="metric-container"] {
-            margin-bottom: 1rem;
-        }
+# Comments and runs of whitespace; the readable sources above are minified once at import
+_MINIFY = re.compile(r"/\*.*?\*/|\s+", re.S)
+_TIGHTEN = re.compile(r"\s*([{};,>])\s*")
 
-        /* Ensure charts are responsive */
-        .js-plotly-plot {
-            width: 100% !important;
-        }
 
-        /* Make tables scrollable */
-        [data-testid="stDataFrame"] {
-            overflow-x: auto;
-        }
-    }
-    </style>
-    """
+def _minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace from a CSS source string."""
+    return _TIGHTEN.sub(r"\1", _MINIFY.sub(" ", css)).strip()
+
+
+# Injected on every run: Streamlit drops elements a rerun does not re-emit,
+# so the <style> block cannot be sent once per session.
+DARK_MODE_CSS = "<style>" + _minify_css(_RAW_DARK) + "</style>"
+LIGHT_MODE_CSS = "<style>" + _minify_css(_RAW_LIGHT) + "</style>"
+
+
+def get_dark_mode_css() -> str:
+    """Return CSS for dark mode styling."""
+    return DARK_MODE_CSS
+
+
+def get_light_mode_css() -> str:
+    """Return CSS for light mode styling (minimal overrides)."""
+    return LIGHT_MODE_CSS
 
 
 def initialize_theme():
@@ -395,4 +397,23 @@ def apply_plot_theme(fig):
             template="plotly_white",
             paper_bgcolor="rgba(0,0,0,0)",
             plot_bgcolor="rgba(0,0,0,0)",
-        )
\ No newline at end of file
+        )
+
+
+def get_vega_config() -> dict:
+    """
+    Vega-Lite config for the current theme, matching apply_plot_theme():
+    transparent background, with light text and dark grid lines in dark mode.
+    """
+    initialize_theme()
+
+    if st.session_state.dark_mode:
+        text = {"labelColor": "#fafafa", "titleColor": "#fafafa"}
+        return {
+            "background": "transparent",
+            "axis": {**text, "gridColor": "#30363d"},
+            "legend": text,
+            "title": {"color": "#fafafa"},
+            "view": {"stroke": None},
+        }
+    return {"background": "transparent", "view": {"stroke": None}}
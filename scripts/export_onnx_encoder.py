@@ -0,0 +1,46 @@
+"""
+Export the retrieval embedding model to ONNX and quantize it to INT8.
+Run once; RetrievalSystem picks up data/onnx_minilm/model_int8.onnx automatically
+on CPU when onnxruntime is installed.
+
+Requires: pip install optimum[onnxruntime] onnxruntime transformers
+"""
+import os
+import sys
+from pathlib import Path
+
+from optimum.onnxruntime import ORTModelForFeatureExtraction
+from onnxruntime.quantization import quantize_dynamic, QuantType
+from transformers import AutoTokenizer
+
+# Add core/ to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'core'))
+
+from retrieval import DEFAULT_ONNX_DIR, ONNX_MODEL_FILE
+
+MODEL_ID = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def export_encoder(output_dir: str = DEFAULT_ONNX_DIR):
+    """Export the encoder to ONNX, then write a dynamically quantized INT8 copy."""
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"[EXPORT] Exporting {MODEL_ID} to ONNX...")
+    model = ORTModelForFeatureExtraction.from_pretrained(MODEL_ID, export=True)
+    model.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(MODEL_ID).save_pretrained(output_dir)
+
+    print("[QUANTIZE] Applying dynamic INT8 quantization...")
+    quantize_dynamic(
+        str(output_dir / "model.onnx"),
+        str(output_dir / ONNX_MODEL_FILE),
+        weight_type=QuantType.QInt8
+    )
+
+    print(f"[OK] Quantized encoder saved to {output_dir / ONNX_MODEL_FILE}")
+    print("[INFO] Delete cached *_onnx_int8.pkl embeddings after re-exporting.")
+
+
+if __name__ == "__main__":
+    export_encoder()
@@ -6,7 +6,9 @@ import os
 import csv
 import json
 import time
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -17,6 +19,16 @@ load_dotenv()
 
 API_KEY = os.getenv("API_KEY", "sk-test")
 URL = "http://127.0.0.1:4000/chat/completions"
+HEADERS = {
+    "Authorization": f"Bearer {API_KEY}",
+    "Content-Type": "application/json"
+}
+SYSTEM_MESSAGE = {"role": "system", "content": "You are a helpful assistant."}
+
+# One keep-alive connection to the proxy for every question instead of a new one per call
+session = requests.Session()
+session.headers.update(HEADERS)
+session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
 
 # Test with just 1-2 models for speed
 TEST_MODELS = [
@@ -43,26 +55,20 @@ def load_test_dataset(limit=5):
 
 def evaluate_question(model_name, q):
     """Evaluate a single question."""
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-        "Content-Type": "application/json"
-    }
-    data = {
+    # Serialized with orjson and sent as raw bytes; the session sets the JSON content type
+    body = orjson.dumps({
         "model": model_name,
-        "messages": [
-            {"role": "system", "content": "You are a helpful assistant."},
-            {"role": "user", "content": q['input']}
-        ],
+        "messages": [SYSTEM_MESSAGE, {"role": "user", "content": q['input']}],
         "max_tokens": 300
-    }
+    })
 
     start_time = time.time()
     try:
-        r = requests.post(URL, headers=headers, json=data, timeout=60)
+        r = session.post(URL, data=body, timeout=60)
         latency = time.time() - start_time
 
         if r.status_code == 200:
-            content = r.json().get("choices", [{}])[0].get("message", {}).get("content", "")
+            content = orjson.loads(r.content).get("choices", [{}])[0].get("message", {}).get("content", "")
             score, reasoning = score_answer(q['expected_output'], content)
         else:
             content = ""
@@ -1,5 +1,9 @@
 import os
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 from typing import Dict, List
 import time
@@ -9,6 +13,14 @@ load_dotenv()
 # Configuration
 API_KEY = "sk-test"
 URL = "http://127.0.0.1:4000/chat/completions"
+HEADERS = {
+    "Authorization": f"Bearer {API_KEY}",
+    "Content-Type": "application/json"
+}
+MESSAGES = [
+    {"role": "system", "content": "You are a helpful assistant."},
+    {"role": "user", "content": "Say 'Hello! I am working correctly.' and tell me your model name."}
+]
 
 # All models from your config
 MODELS = [
@@ -28,30 +40,36 @@ MODELS = [
 
 ]
 
+# Models are tested concurrently; each call is pure network wait
+MAX_WORKERS = 16
+
+def create_session() -> requests.Session:
+    """Keep-alive session shared by all test calls, pooled for MAX_WORKERS threads."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=MAX_WORKERS,
+        max_retries=Retry(total=2, backoff_factor=0.2)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+session = create_session()
+
 def test_model(model_name: str) -> Dict:
     """Test a single model and return results"""
-    headers = {
-        "Authorization": f"Bearer {API_KEY}",
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "model": model_name,
-        "messages": [
-            {"role": "system", "content": "You are a helpful assistant."},
-            {"role": "user", "content": "Say 'Hello! I am working correctly.' and tell me your model name."}
-        ],
-        "max_tokens": 1000
-    }
+    body = orjson.dumps({"model": model_name, "messages": MESSAGES, "max_tokens": 1000})
     
     start_time = time.time()
     
     try:
-        response = requests.post(URL, headers=headers, json=data, timeout=30)
+        response = session.post(URL, data=body, timeout=30)
         elapsed_time = time.time() - start_time
         
         if response.status_code == 200:
-            result = response.json()
+            result = orjson.loads(response.content)
             content = result.get("choices", [{}])[0].get("message", {}).get("content", "No response")
             return {
                 "status": "✅ SUCCESS",
@@ -103,16 +121,18 @@ def test_all_models():
     """Test all models and generate a summary report"""
     print("🚀 Starting model testing...\n")
     
-    results = []
-    
-    for model in MODELS:
-        print(f"Testing {model}...", end=" ")
-        result = test_model(model)
-        results.append(result)
-        print(result['status'])
-        
-        # Small delay to avoid rate limiting
-        time.sleep(0.5)
+    results_by_model = {}
+
+    # Each model sits behind a different provider, so test them all at once
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(MODELS))) as executor:
+        futures = {executor.submit(test_model, model): model for model in MODELS}
+        for future in as_completed(futures):
+            result = future.result()
+            results_by_model[futures[future]] = result
+            print(f"Tested {result['model']}... {result['status']}")
+
+    # Report in configuration order, not completion order
+    results = [results_by_model[model] for model in MODELS]
     
     # Print detailed results
     print("\n" + "="*80)
@@ -147,14 +167,17 @@ def test_all_models():
 def test_specific_models(model_list: List[str]):
     """Test specific models from a list"""
     print(f"🚀 Testing {len(model_list)} specific models...\n")
-    
+
+    known_models = [model for model in model_list if model in MODELS]
     for model in model_list:
-        if model in MODELS:
-            result = test_model(model)
-            print_result(result)
-        else:
+        if model not in MODELS:
             print(f"⚠️ Model '{model}' not found in configuration")
 
+    # Same fan-out as test_all_models; map() yields results in list order
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(known_models) or 1)) as executor:
+        for result in executor.map(test_model, known_models):
+            print_result(result)
+
 if __name__ == "__main__":
     # Test all models
     test_all_models()